@@ -11,10 +11,34 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""
 
+    # Storage ("supabase" or "sqlite")
+    storage_backend: str = "supabase"
+    sqlite_path: str = "dealhunter.db"
+
+    # Email ("resend", or "log" as a no-network stand-in for local load tests)
+    email_backend: str = "resend"
+
+    # Bearer token for /api/admin (admin API disabled when empty)
+    admin_token: str = ""
+
     # App Config
     demo_alert_email: str = "alerts@kliuiev.com"
     frontend_url: str = "https://dealhunter.kliuiev.com"
 
+    # Serving (0 workers = one per available core)
+    web_concurrency: int = 0
+    bus_dir: str = ""
+
+    # OpenAI transport (seconds); the budget bounds a whole chat completion
+    llm_request_budget: float = 20.0
+    llm_connect_timeout: float = 3.0
+    llm_max_retries: int = 2
+
+    # Write-behind buffer for price_history/alerts appends
+    write_buffer_max_rows: int = 500
+    write_buffer_interval: float = 1.0
+    write_buffer_max_pending: int = 50000
+
     class Config:
         env_file = "../.env"
 
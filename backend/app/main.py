@@ -1,15 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import chat, products, alerts, demo
+from app.routers import chat, products, alerts, demo, export, admin
 from app.config import get_settings
+from app.responses import ORJSONResponse
+from app.services import bus
+from app.services.profiler import ProfilerMiddleware
+from app.services.write_buffer import get_write_buffer
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Join the cross-worker invalidation bus
+    bus.start()
+    get_write_buffer().start()
+    yield
+    # Flush buffered appends before the worker exits
+    await get_write_buffer().stop()
+    bus.stop()
+
+
 app = FastAPI(
     title="DealHunter API",
     description="AI-powered deal tracking assistant",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -29,16 +49,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Lets the admin profiler attribute samples to routes
+app.add_middleware(ProfilerMiddleware)
+
 # Include routers
 app.include_router(chat.router)
 app.include_router(products.router)
 app.include_router(alerts.router)
 app.include_router(demo.router)
+app.include_router(export.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    buffer = get_write_buffer()
+    return {
+        "status": "healthy",
+        "write_buffer": buffer.depth(),
+        "write_buffer_dropped": buffer.dropped,
+    }
 
 
 @app.get("/")
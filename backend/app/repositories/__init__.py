@@ -0,0 +1,24 @@
+"""Storage backends selected via Settings.storage_backend."""
+
+from functools import lru_cache
+
+from app.config import get_settings
+from app.repositories.base import DEFAULT_EMAIL, Repository
+
+
+@lru_cache()
+def get_repository() -> Repository:
+    """Get the cached repository for the configured storage backend."""
+    settings = get_settings()
+
+    if settings.storage_backend == "sqlite":
+        from app.repositories.sqlite import SQLiteRepository
+
+        return SQLiteRepository(settings.sqlite_path)
+
+    if settings.storage_backend == "supabase":
+        from app.repositories.supabase import SupabaseRepository
+
+        return SupabaseRepository()
+
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
@@ -0,0 +1,115 @@
+"""Storage interface shared by all repository backends."""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+# Owner of tracked items created without an email (single-user POC)
+DEFAULT_EMAIL = "alerts@kliuiev.com"
+
+
+class Repository(ABC):
+    """
+    Data access for products, tracked items, price history and alerts.
+
+    Rows are plain dicts shaped like the Supabase responses the rest of
+    the app already consumes (tracked items embed their product under
+    "products").
+    """
+
+    # Products
+
+    @abstractmethod
+    def list_products(self) -> list[dict]:
+        """Get all products."""
+
+    @abstractmethod
+    def search_products(self, pattern: str, limit: int) -> list[dict]:
+        """Get products whose name matches a case-insensitive LIKE pattern."""
+
+    @abstractmethod
+    def get_products_by_category(
+        self, category: str, max_price: Optional[float], limit: int
+    ) -> list[dict]:
+        """Get products whose category contains `category`."""
+
+    @abstractmethod
+    def list_category_products(
+        self, category: str, max_price: Optional[float]
+    ) -> list[dict]:
+        """Get every product in a category (unbounded, for ranking)."""
+
+    @abstractmethod
+    def get_products_by_ids(self, product_ids: list[str]) -> list[dict]:
+        """Get full product rows by id (missing ids are omitted)."""
+
+    @abstractmethod
+    def get_product(self, product_id: str) -> Optional[dict]:
+        """Get a single product by id."""
+
+    @abstractmethod
+    def insert_products(self, rows: list[dict]) -> list[dict]:
+        """Insert catalog products and return the created rows."""
+
+    @abstractmethod
+    def update_product_price(self, product_id: str, price: float) -> None:
+        """Set a product's current price."""
+
+    @abstractmethod
+    def reset_product_prices(self) -> None:
+        """Reset every product with an original price back to it."""
+
+    # Tracked items
+
+    @abstractmethod
+    def insert_tracked_items(self, rows: list[dict]) -> list[dict]:
+        """Insert tracked items and return the created rows."""
+
+    @abstractmethod
+    def list_tracked_items(self, item_ids: Optional[list[str]] = None) -> list[dict]:
+        """
+        Get tracked items (all, or those in `item_ids`) with their product
+        under "products" and their most recent alert under "latest_alert".
+        """
+
+    @abstractmethod
+    def list_tracked_product_ids(self, product_ids: list[str]) -> set[str]:
+        """Get which of the given products are already tracked."""
+
+    # Price history and alerts
+
+    @abstractmethod
+    def insert_price_history(self, rows: list[dict]) -> None:
+        """Append price history rows."""
+
+    @abstractmethod
+    def get_price_stats(self, product_ids: list[str]) -> dict[str, dict]:
+        """Get persisted rolling price stats by product id."""
+
+    @abstractmethod
+    def upsert_price_stats(self, rows: list[dict]) -> None:
+        """Persist {product_id, stats} rows (the last row per product wins)."""
+
+    @abstractmethod
+    def insert_alerts(self, rows: list[dict]) -> None:
+        """Append alert rows."""
+
+    @abstractmethod
+    def list_alerts(self) -> list[dict]:
+        """Get all alerts flattened with their product name."""
+
+    # Export
+
+    @abstractmethod
+    def page_rows(
+        self, table: str, after: Optional[tuple[str, str]], limit: int
+    ) -> list[dict]:
+        """
+        Get a keyset page of an append-only table ("price_history" or
+        "alerts") ordered by (created_at, id), starting after `after`.
+        """
+
+    # Demo
+
+    @abstractmethod
+    def clear_demo_data(self) -> None:
+        """Delete all alerts, tracked items, price history and price stats."""
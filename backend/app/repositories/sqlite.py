@@ -0,0 +1,369 @@
+"""Repository backed by an embedded SQLite database."""
+
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+
+from app.repositories.base import DEFAULT_EMAIL, Repository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    current_price REAL NOT NULL,
+    original_price REAL,
+    image_url TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tracked_items (
+    id TEXT PRIMARY KEY,
+    product_id TEXT NOT NULL REFERENCES products(id),
+    target_price REAL NOT NULL,
+    email TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    id TEXT PRIMARY KEY,
+    product_id TEXT NOT NULL REFERENCES products(id),
+    price REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_stats (
+    product_id TEXT PRIMARY KEY REFERENCES products(id),
+    stats BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    id TEXT PRIMARY KEY,
+    tracked_item_id TEXT NOT NULL REFERENCES tracked_items(id),
+    old_price REAL,
+    new_price REAL,
+    email_sent INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products(category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tracked_items_product ON tracked_items(product_id);
+CREATE INDEX IF NOT EXISTS idx_price_history_product
+    ON price_history(product_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_alerts_tracked_item ON alerts(tracked_item_id);
+CREATE INDEX IF NOT EXISTS idx_alerts_tracked_item_created
+    ON alerts(tracked_item_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_price_history_created ON price_history(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_created_id ON alerts(created_at, id);
+"""
+
+# Demo catalog inserted into an empty database
+DEMO_PRODUCTS = [
+    {
+        "name": 'Samsung 65" QLED 4K Smart TV',
+        "category": "TV",
+        "current_price": 1099.99,
+        "original_price": 1099.99,
+    },
+    {
+        "name": "Sony WH-1000XM5 Wireless Headphones",
+        "category": "Headphones",
+        "current_price": 399.99,
+        "original_price": 399.99,
+    },
+    {
+        "name": "Apple MacBook Air 13-inch Laptop",
+        "category": "Laptop",
+        "current_price": 1199.99,
+        "original_price": 1199.99,
+    },
+]
+
+# All statements are constants so sqlite3's statement cache reuses them
+SQL_LIST_PRODUCTS = "SELECT * FROM products"
+SQL_SEARCH_PRODUCTS = "SELECT * FROM products WHERE name LIKE ? LIMIT ?"
+SQL_PRODUCTS_BY_CATEGORY = "SELECT * FROM products WHERE category LIKE ? LIMIT ?"
+SQL_PRODUCTS_BY_CATEGORY_MAX = (
+    "SELECT * FROM products WHERE category LIKE ? AND current_price <= ? LIMIT ?"
+)
+SQL_CATEGORY_PRODUCTS = (
+    "SELECT id, name, category, current_price, original_price, image_url "
+    "FROM products WHERE category LIKE ?"
+)
+SQL_CATEGORY_PRODUCTS_MAX = SQL_CATEGORY_PRODUCTS + " AND current_price <= ?"
+SQL_GET_PRODUCT = "SELECT * FROM products WHERE id = ?"
+SQL_UPDATE_PRICE = "UPDATE products SET current_price = ? WHERE id = ?"
+SQL_RESET_PRICES = (
+    "UPDATE products SET current_price = original_price "
+    "WHERE original_price IS NOT NULL"
+)
+SQL_INSERT_PRODUCT = (
+    "INSERT INTO products "
+    "(id, name, category, current_price, original_price, image_url, created_at) "
+    "VALUES (:id, :name, :category, :current_price, :original_price, "
+    ":image_url, :created_at)"
+)
+SQL_INSERT_TRACKED = (
+    "INSERT INTO tracked_items (id, product_id, target_price, email, created_at) "
+    "VALUES (:id, :product_id, :target_price, :email, :created_at)"
+)
+# Tracked items with their product and most recent alert (a_ columns)
+SQL_LIST_TRACKED = (
+    "SELECT t.id, t.product_id, t.target_price, t.email, t.created_at, "
+    "p.id AS p_id, p.name AS p_name, p.category AS p_category, "
+    "p.current_price AS p_current_price, p.original_price AS p_original_price, "
+    "p.image_url AS p_image_url, p.created_at AS p_created_at, "
+    "a.id AS a_id, a.tracked_item_id AS a_tracked_item_id, "
+    "a.old_price AS a_old_price, a.new_price AS a_new_price, "
+    "a.email_sent AS a_email_sent, a.created_at AS a_created_at "
+    "FROM tracked_items t LEFT JOIN products p ON p.id = t.product_id "
+    "LEFT JOIN alerts a ON a.id = ("
+    "SELECT id FROM alerts WHERE tracked_item_id = t.id "
+    "ORDER BY created_at DESC, id DESC LIMIT 1"
+    ")"
+)
+SQL_INSERT_HISTORY = (
+    "INSERT INTO price_history (id, product_id, price, created_at) "
+    "VALUES (:id, :product_id, :price, :created_at)"
+)
+SQL_UPSERT_STATS = (
+    "INSERT INTO price_stats (product_id, stats) VALUES (?, ?) "
+    "ON CONFLICT(product_id) DO UPDATE SET stats = excluded.stats"
+)
+SQL_INSERT_ALERT = (
+    "INSERT INTO alerts "
+    "(id, tracked_item_id, old_price, new_price, email_sent, created_at) "
+    "VALUES (:id, :tracked_item_id, :old_price, :new_price, :email_sent, "
+    ":created_at)"
+)
+SQL_LIST_ALERTS = (
+    "SELECT a.id, COALESCE(p.name, 'Unknown Product') AS product_name, "
+    "a.old_price, a.new_price, a.email_sent, a.created_at "
+    "FROM alerts a "
+    "LEFT JOIN tracked_items t ON t.id = a.tracked_item_id "
+    "LEFT JOIN products p ON p.id = t.product_id"
+)
+# Keyset pages over the append-only tables, ordered by (created_at, id)
+SQL_PAGE = {
+    "price_history": (
+        "SELECT id, product_id, price, created_at FROM price_history "
+        "WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?"
+    ),
+    "alerts": (
+        "SELECT id, tracked_item_id, old_price, new_price, email_sent, created_at "
+        "FROM alerts WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?"
+    ),
+}
+
+def _now() -> str:
+    """Current UTC time in the ISO format Supabase returns."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _with_defaults(row: dict) -> dict:
+    """Fill in the id and created_at columns the database would default."""
+    return {"id": str(uuid.uuid4()), "created_at": _now(), **row}
+
+
+class SQLiteRepository(Repository):
+    """
+    Embedded SQLite storage.
+
+    One connection is shared behind a lock, so calls within a worker run
+    one at a time. WAL mode lets other worker processes keep reading the
+    same file while one of them writes.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        # Wait out other workers' write transactions instead of failing
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, cached_statements=128, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        """
+        Create the schema and insert the demo catalog into an empty database.
+
+        Both happen in one immediate (write-locked) transaction, so workers
+        opening a fresh file at the same time seed it exactly once.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        self._conn.execute(statement)
+                if not self._conn.execute("SELECT 1 FROM products LIMIT 1").fetchone():
+                    self._conn.executemany(
+                        SQL_INSERT_PRODUCT,
+                        [_with_defaults({"image_url": None, **p}) for p in DEMO_PRODUCTS],
+                    )
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def _write(self, sql: str, params: tuple = ()) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def _write_many(self, sql: str, rows: list[dict]) -> None:
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+
+    def list_products(self) -> list[dict]:
+        return self._query(SQL_LIST_PRODUCTS)
+
+    def search_products(self, pattern: str, limit: int) -> list[dict]:
+        return self._query(SQL_SEARCH_PRODUCTS, (pattern, limit))
+
+    def get_products_by_category(
+        self, category: str, max_price: Optional[float], limit: int
+    ) -> list[dict]:
+        if max_price:
+            return self._query(
+                SQL_PRODUCTS_BY_CATEGORY_MAX, (f"%{category}%", max_price, limit)
+            )
+        return self._query(SQL_PRODUCTS_BY_CATEGORY, (f"%{category}%", limit))
+
+    def list_category_products(
+        self, category: str, max_price: Optional[float]
+    ) -> list[dict]:
+        if max_price:
+            return self._query(SQL_CATEGORY_PRODUCTS_MAX, (f"%{category}%", max_price))
+        return self._query(SQL_CATEGORY_PRODUCTS, (f"%{category}%",))
+
+    def get_products_by_ids(self, product_ids: list[str]) -> list[dict]:
+        if not product_ids:
+            return []
+        placeholders = ",".join("?" * len(product_ids))
+        return self._query(
+            f"SELECT * FROM products WHERE id IN ({placeholders})",
+            tuple(product_ids),
+        )
+
+    def get_product(self, product_id: str) -> Optional[dict]:
+        rows = self._query(SQL_GET_PRODUCT, (product_id,))
+        return rows[0] if rows else None
+
+    def insert_products(self, rows: list[dict]) -> list[dict]:
+        created = [
+            _with_defaults({"original_price": None, "image_url": None, **row})
+            for row in rows
+        ]
+        self._write_many(SQL_INSERT_PRODUCT, created)
+        return created
+
+    def update_product_price(self, product_id: str, price: float) -> None:
+        self._write(SQL_UPDATE_PRICE, (price, product_id))
+
+    def reset_product_prices(self) -> None:
+        self._write(SQL_RESET_PRICES)
+
+    def insert_tracked_items(self, rows: list[dict]) -> list[dict]:
+        created = [
+            _with_defaults({"email": DEFAULT_EMAIL, **row}) for row in rows
+        ]
+        self._write_many(SQL_INSERT_TRACKED, created)
+        return created
+
+    def list_tracked_items(self, item_ids: Optional[list[str]] = None) -> list[dict]:
+        if item_ids is None:
+            rows = self._query(SQL_LIST_TRACKED)
+        elif item_ids:
+            placeholders = ",".join("?" * len(item_ids))
+            rows = self._query(
+                SQL_LIST_TRACKED + f" WHERE t.id IN ({placeholders})", tuple(item_ids)
+            )
+        else:
+            rows = []
+
+        items = []
+        for row in rows:
+            product = {
+                key[2:]: row.pop(key) for key in list(row) if key.startswith("p_")
+            }
+            alert = {
+                key[2:]: row.pop(key) for key in list(row) if key.startswith("a_")
+            }
+            row["products"] = product if product["id"] else None
+            if alert["id"]:
+                alert["email_sent"] = bool(alert["email_sent"])
+                row["latest_alert"] = alert
+            else:
+                row["latest_alert"] = None
+            items.append(row)
+        return items
+
+    def list_tracked_product_ids(self, product_ids: list[str]) -> set[str]:
+        if not product_ids:
+            return set()
+        placeholders = ",".join("?" * len(product_ids))
+        rows = self._query(
+            "SELECT DISTINCT product_id FROM tracked_items "
+            f"WHERE product_id IN ({placeholders})",
+            tuple(product_ids),
+        )
+        return {row["product_id"] for row in rows}
+
+    def insert_price_history(self, rows: list[dict]) -> None:
+        self._write_many(SQL_INSERT_HISTORY, [_with_defaults(r) for r in rows])
+
+    def get_price_stats(self, product_ids: list[str]) -> dict[str, dict]:
+        if not product_ids:
+            return {}
+        placeholders = ",".join("?" * len(product_ids))
+        rows = self._query(
+            f"SELECT product_id, stats FROM price_stats WHERE product_id IN ({placeholders})",
+            tuple(product_ids),
+        )
+        return {row["product_id"]: orjson.loads(row["stats"]) for row in rows}
+
+    def upsert_price_stats(self, rows: list[dict]) -> None:
+        stats = {row["product_id"]: row["stats"] for row in rows}
+        if not stats:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                SQL_UPSERT_STATS,
+                [(pid, orjson.dumps(data)) for pid, data in stats.items()],
+            )
+
+    def insert_alerts(self, rows: list[dict]) -> None:
+        self._write_many(SQL_INSERT_ALERT, [_with_defaults(r) for r in rows])
+
+    def list_alerts(self) -> list[dict]:
+        alerts = self._query(SQL_LIST_ALERTS)
+        for alert in alerts:
+            alert["email_sent"] = bool(alert["email_sent"])
+        return alerts
+
+    def page_rows(
+        self, table: str, after: Optional[tuple[str, str]], limit: int
+    ) -> list[dict]:
+        created_at, row_id = after or ("", "")
+        rows = self._query(SQL_PAGE[table], (created_at, row_id, limit))
+        if table == "alerts":
+            for row in rows:
+                row["email_sent"] = bool(row["email_sent"])
+        return rows
+
+    def clear_demo_data(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM alerts")
+            self._conn.execute("DELETE FROM tracked_items")
+            self._conn.execute("DELETE FROM price_history")
+            self._conn.execute("DELETE FROM price_stats")
@@ -0,0 +1,256 @@
+"""Repository backed by the remote Supabase PostgREST API."""
+
+from typing import Optional
+
+from app.db import get_db
+from app.repositories.base import Repository
+
+# Placeholder id used to express "delete all rows" through PostgREST
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# Rows per page for unbounded reads (PostgREST caps responses at 1000)
+PAGE_SIZE = 1000
+
+# Exportable append-only tables and their columns
+EXPORT_COLUMNS = {
+    "price_history": "id, product_id, price, created_at",
+    "alerts": "id, tracked_item_id, old_price, new_price, email_sent, created_at",
+}
+
+
+class SupabaseRepository(Repository):
+    """Supabase (PostgreSQL) storage."""
+
+    def list_products(self) -> list[dict]:
+        products: list[dict] = []
+        while True:
+            start = len(products)
+            page = (
+                get_db()
+                .table("products")
+                .select("*")
+                .order("id")
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+            )
+            products.extend(page.data)
+            if len(page.data) < PAGE_SIZE:
+                return products
+
+    def search_products(self, pattern: str, limit: int) -> list[dict]:
+        result = (
+            get_db()
+            .table("products")
+            .select("*")
+            .ilike("name", pattern)
+            .limit(limit)
+            .execute()
+        )
+        return result.data
+
+    def get_products_by_category(
+        self, category: str, max_price: Optional[float], limit: int
+    ) -> list[dict]:
+        query = (
+            get_db().table("products").select("*").ilike("category", f"%{category}%")
+        )
+        if max_price:
+            query = query.lte("current_price", max_price)
+        return query.limit(limit).execute().data
+
+    def list_category_products(
+        self, category: str, max_price: Optional[float]
+    ) -> list[dict]:
+        products: list[dict] = []
+        while True:
+            query = (
+                get_db()
+                .table("products")
+                .select("id, name, category, current_price, original_price, image_url")
+                .ilike("category", f"%{category}%")
+            )
+            if max_price:
+                query = query.lte("current_price", max_price)
+            start = len(products)
+            page = query.order("id").range(start, start + PAGE_SIZE - 1).execute()
+            products.extend(page.data)
+            if len(page.data) < PAGE_SIZE:
+                return products
+
+    def get_products_by_ids(self, product_ids: list[str]) -> list[dict]:
+        if not product_ids:
+            return []
+        result = (
+            get_db()
+            .table("products")
+            .select("*")
+            .in_("id", product_ids)
+            .execute()
+        )
+        return result.data
+
+    def get_product(self, product_id: str) -> Optional[dict]:
+        result = (
+            get_db()
+            .table("products")
+            .select("*")
+            .eq("id", product_id)
+            .single()
+            .execute()
+        )
+        return result.data
+
+    def insert_products(self, rows: list[dict]) -> list[dict]:
+        if not rows:
+            return []
+        return get_db().table("products").insert(rows).execute().data
+
+    def update_product_price(self, product_id: str, price: float) -> None:
+        get_db().table("products").update({"current_price": price}).eq(
+            "id", product_id
+        ).execute()
+
+    def reset_product_prices(self) -> None:
+        db = get_db()
+        products_result = (
+            db.table("products")
+            .select("id, original_price")
+            .not_.is_("original_price", "null")
+            .execute()
+        )
+        for product in products_result.data:
+            db.table("products").update(
+                {"current_price": product["original_price"]}
+            ).eq("id", product["id"]).execute()
+
+    def insert_tracked_items(self, rows: list[dict]) -> list[dict]:
+        if not rows:
+            return []
+        return get_db().table("tracked_items").insert(rows).execute().data
+
+    def list_tracked_items(self, item_ids: Optional[list[str]] = None) -> list[dict]:
+        if item_ids == []:
+            return []
+        items: list[dict] = []
+        while True:
+            # Only each item's most recent alert is embedded
+            query = (
+                get_db()
+                .table("tracked_items")
+                .select("*, products(*), alerts(*)")
+                .order("created_at", desc=True, foreign_table="alerts")
+                .limit(1, foreign_table="alerts")
+            )
+            if item_ids is not None:
+                query = query.in_("id", item_ids)
+            start = len(items)
+            page = query.order("id").range(start, start + PAGE_SIZE - 1).execute()
+            items.extend(page.data)
+            if len(page.data) < PAGE_SIZE:
+                break
+
+        for item in items:
+            alerts = item.pop("alerts", None)
+            item["latest_alert"] = alerts[0] if alerts else None
+        return items
+
+    def list_tracked_product_ids(self, product_ids: list[str]) -> set[str]:
+        if not product_ids:
+            return set()
+        tracked: set[str] = set()
+        start = 0
+        while True:
+            page = (
+                get_db()
+                .table("tracked_items")
+                .select("product_id")
+                .in_("product_id", product_ids)
+                .order("id")
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+            )
+            tracked.update(row["product_id"] for row in page.data)
+            if len(page.data) < PAGE_SIZE:
+                return tracked
+            start += PAGE_SIZE
+
+    def insert_price_history(self, rows: list[dict]) -> None:
+        if rows:
+            get_db().table("price_history").insert(rows).execute()
+
+    def get_price_stats(self, product_ids: list[str]) -> dict[str, dict]:
+        if not product_ids:
+            return {}
+        result = (
+            get_db()
+            .table("price_stats")
+            .select("product_id, stats")
+            .in_("product_id", product_ids)
+            .execute()
+        )
+        return {row["product_id"]: row["stats"] for row in result.data}
+
+    def upsert_price_stats(self, rows: list[dict]) -> None:
+        stats = {row["product_id"]: row["stats"] for row in rows}
+        if stats:
+            get_db().table("price_stats").upsert(
+                [{"product_id": pid, "stats": data} for pid, data in stats.items()]
+            ).execute()
+
+    def insert_alerts(self, rows: list[dict]) -> None:
+        if rows:
+            get_db().table("alerts").insert(rows).execute()
+
+    def list_alerts(self) -> list[dict]:
+        result = (
+            get_db()
+            .table("alerts")
+            .select("*, tracked_items(product_id, products(name))")
+            .execute()
+        )
+
+        alerts = []
+        for alert in result.data:
+            product_name = "Unknown Product"
+            tracked_items = alert.get("tracked_items")
+            if tracked_items:
+                products = tracked_items.get("products")
+                if products:
+                    product_name = products.get("name", "Unknown Product")
+
+            alerts.append(
+                {
+                    "id": alert.get("id"),
+                    "product_name": product_name,
+                    "old_price": alert.get("old_price"),
+                    "new_price": alert.get("new_price"),
+                    "email_sent": alert.get("email_sent"),
+                    "created_at": alert.get("created_at"),
+                }
+            )
+        return alerts
+
+    def page_rows(
+        self, table: str, after: Optional[tuple[str, str]], limit: int
+    ) -> list[dict]:
+        query = get_db().table(table).select(EXPORT_COLUMNS[table])
+        if after:
+            created_at, row_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{row_id})'
+            )
+        return query.order("created_at").order("id").limit(limit).execute().data
+
+    def clear_demo_data(self) -> None:
+        db = get_db()
+        # Delete alerts FIRST (FK child references tracked_items)
+        db.table("alerts").delete().neq("tracked_item_id", NIL_UUID).execute()
+        # Delete tracked_items SECOND (FK parent)
+        db.table("tracked_items").delete().neq("product_id", NIL_UUID).execute()
+        db.table("price_history").delete().neq("product_id", NIL_UUID).execute()
+        try:
+            db.table("price_stats").delete().neq("product_id", NIL_UUID).execute()
+        except Exception as e:
+            # Missing table (migration not applied): nothing to clear
+            print(f"Could not clear price_stats: {e}")
@@ -0,0 +1,18 @@
+"""JSON response class rendering with orjson."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    Defined here rather than imported from FastAPI, whose ORJSONResponse
+    is deprecated in newer releases and warns on every request.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,61 @@
+"""Admin router with the on-demand sampling profiler."""
+
+import asyncio
+import hmac
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.config import get_settings
+from app.services.profiler import (
+    ProfileSession,
+    end_session,
+    profiler_available,
+    start_session,
+)
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Check the bearer token against ADMIN_TOKEN (admin API is off without one)."""
+    token = get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = (authorization or "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=300),
+    route: Optional[str] = None,
+    requests: Optional[int] = Query(None, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: Literal["json", "collapsed"] = "json",
+):
+    """
+    Sample this worker's CPU time and return stacks attributed to routes.
+
+    Runs for `seconds`, or until `requests` requests whose route contains
+    `route` have finished. Samples outside matching requests are dropped
+    when `route` is set. `format=collapsed` returns plain collapsed stacks
+    for flamegraph.pl / speedscope.
+    """
+    if not profiler_available():
+        raise HTTPException(status_code=501, detail="Profiling needs a POSIX host")
+
+    session = ProfileSession(seconds, interval_ms / 1000, route, requests)
+    if not start_session(session):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    try:
+        await asyncio.to_thread(session.done.wait, seconds)
+    finally:
+        end_session(session)
+
+    if format == "collapsed":
+        return PlainTextResponse(session.collapsed())
+    return {**session.summary(), "collapsed": session.collapsed()}
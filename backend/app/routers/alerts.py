@@ -6,10 +6,11 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException
 
 from app.config import get_settings
-from app.db import get_db
+from app.repositories import get_repository
 from app.models.schemas import SimulateRequest
-from app.services.email import send_price_alert
+from app.services.alerts import apply_price_change, trigger_alert
 from app.services.products import get_tracked_items
+from app.services.write_buffer import get_write_buffer
 
 router = APIRouter(prefix="/api/alerts", tags=["alerts"])
 settings = get_settings()
@@ -22,8 +23,6 @@ async def simulate_price_drop(request: Optional[SimulateRequest] = None):
     Updates the first tracked item's product price to below target.
     Sends email alert to configured demo email.
     """
-    db = get_db()
-
     # Get tracked items
     items = get_tracked_items()
 
@@ -53,41 +52,13 @@ async def simulate_price_drop(request: Optional[SimulateRequest] = None):
     price_drop = random.uniform(10, 50)
     new_price = target_price - price_drop
 
-    # Update product price
-    db.table("products").update({"current_price": new_price}).eq(
-        "id", product_id
-    ).execute()
-
-    # Add to price history
-    db.table("price_history").insert(
-        {"product_id": product_id, "price": new_price}
-    ).execute()
+    # Update product price, history and stats
+    deal = apply_price_change(product_id, new_price, old_price=old_price)
 
-    # Send email alert
-    email_sent = False
-    email_error = None
-    try:
-        email_sent = await send_price_alert(
-            to_email=recipient_email,
-            product_name=product.get("name", "Unknown Product"),
-            old_price=old_price,
-            new_price=new_price,
-            target_price=target_price,
-            product_url="#",  # No real URL for POC
-        )
-    except Exception as e:
-        email_error = str(e)
-        print(f"Email send failed: {e}")
-
-    # Create alert record
-    db.table("alerts").insert(
-        {
-            "tracked_item_id": item["id"],
-            "old_price": old_price,
-            "new_price": new_price,
-            "email_sent": email_sent,
-        }
-    ).execute()
+    # Send email alert and record it
+    alert = await trigger_alert(item, old_price, new_price, recipient_email)
+    # The UI refetches alerts as soon as this returns, so write it through
+    await get_write_buffer().flush("alerts")
 
     return {
         "success": True,
@@ -97,46 +68,19 @@ async def simulate_price_drop(request: Optional[SimulateRequest] = None):
         "old_price": old_price,
         "new_price": new_price,
         "target_price": target_price,
-        "email_sent": email_sent,
+        "all_time_low": deal["all_time_low"],
+        "real_deal": deal["real_deal"],
+        "email_sent": alert["email_sent"],
         "email_recipient": recipient_email,
-        "email_error": email_error,
+        "email_error": alert["email_error"],
     }
 
 
 @router.get("")
 async def get_alerts():
     """Get all triggered alerts with product names."""
-    db = get_db()
-
     try:
-        # Try nested embed query
-        result = (
-            db.table("alerts")
-            .select("*, tracked_items(product_id, products(name))")
-            .execute()
-        )
-
-        alerts = []
-        for alert in result.data:
-            product_name = "Unknown Product"
-            tracked_items = alert.get("tracked_items")
-            if tracked_items:
-                products = tracked_items.get("products")
-                if products:
-                    product_name = products.get("name", "Unknown Product")
-
-            alerts.append(
-                {
-                    "id": alert.get("id"),
-                    "product_name": product_name,
-                    "old_price": alert.get("old_price"),
-                    "new_price": alert.get("new_price"),
-                    "email_sent": alert.get("email_sent"),
-                    "created_at": alert.get("created_at"),
-                }
-            )
-
-        return {"alerts": alerts}
+        return {"alerts": get_repository().list_alerts()}
     except Exception as e:
         print(f"Error fetching alerts: {e}")
         return {"alerts": []}
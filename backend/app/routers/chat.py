@@ -1,57 +1,124 @@
 """Chat router with SSE streaming."""
 
-import json
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
 from app.models.schemas import ChatMessage
-from app.services.llm import process_message, get_tool_response
+from app.services.llm import (
+    MAX_TOKENS,
+    usage_stats,
+    process_message,
+    get_tool_response,
+)
+from app.services.sse import DONE_FRAME, error_frame, text_frames, tool_frame
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# Seconds between client disconnect checks
+DISCONNECT_POLL_INTERVAL = 0.25
+
+# Per-process stream counters (see GET /api/chat/stats)
+stream_stats = {
+    "streams": 0,
+    "cancelled_streams": 0,
+    "cancelled_llm_calls": 0,
+    # Upper bound: the completion budget of each cancelled LLM call
+    "saved_tokens_estimate": 0,
+}
+
+
+class ClientDisconnected(Exception):
+    """The SSE client went away while upstream work was in flight."""
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
 
-async def generate_stream(message: str, session_id: str):
-    """Generate SSE stream for chat response."""
+
+async def _unless_disconnected(coro, watcher: asyncio.Task):
+    """Await `coro`, cancelling it if the client disconnects first."""
+    task = asyncio.ensure_future(coro)
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        raise ClientDisconnected()
+    finally:
+        task.cancel()
+
+
+def _record_cancel(stage: str) -> None:
+    stream_stats["cancelled_streams"] += 1
+    if stage == "llm":
+        stream_stats["cancelled_llm_calls"] += 1
+        stream_stats["saved_tokens_estimate"] += MAX_TOKENS
+
+
+async def generate_stream(message: str, session_id: str, request: Request):
+    """Generate SSE stream for chat response, stopping if the client leaves."""
+    stream_stats["streams"] += 1
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    stage = "llm"
     try:
         # Get initial response from LLM
-        result = await process_message(message, session_id)
+        result = await _unless_disconnected(
+            process_message(message, session_id), watcher
+        )
 
         # Handle tool calls if present
         if result.get("tool_calls"):
             for tool_call in result["tool_calls"]:
+                # Tools run synchronous DB work and can't be interrupted, so
+                # a disconnect is only noticed once the tool has finished
+                stage = "tool"
                 tool_result = await get_tool_response(
                     tool_call["name"], tool_call["arguments"]
                 )
+                if watcher.done():
+                    raise ClientDisconnected()
+                stage = "frames"
                 # Stream tool execution status
-                yield f"data: {json.dumps({'type': 'tool', 'name': tool_call['name']})}\n\n"
+                yield tool_frame(tool_call["name"])
 
                 # Get final response after tool execution
                 # In a real implementation, we'd pass tool results back to LLM
                 # For POC, we'll use the tool result directly
                 final_response = tool_result
 
-                # Stream the response in chunks
-                words = final_response.split()
-                for i, word in enumerate(words):
-                    chunk = word + (" " if i < len(words) - 1 else "")
-                    yield f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n"
+                # Stream the response in batched chunks
+                for frame in text_frames(final_response):
+                    if watcher.done():
+                        raise ClientDisconnected()
+                    yield frame
         else:
             # No tool calls - stream the content directly
+            stage = "frames"
             content = result.get("content", "")
-            if content:
-                words = content.split()
-                for i, word in enumerate(words):
-                    chunk = word + (" " if i < len(words) - 1 else "")
-                    yield f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n"
+            for frame in text_frames(content):
+                if watcher.done():
+                    raise ClientDisconnected()
+                yield frame
 
         # Send done signal
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
-
+        yield DONE_FRAME
+
+    except ClientDisconnected:
+        # Nobody is listening anymore - stop without emitting frames
+        _record_cancel(stage)
+    except (asyncio.CancelledError, GeneratorExit):
+        # The server tore the stream down (e.g. on disconnect)
+        _record_cancel(stage)
+        raise
     except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+        yield error_frame(str(e))
+    finally:
+        watcher.cancel()
 
 
 @router.post("")
-async def chat(request: ChatMessage):
+async def chat(request: ChatMessage, http_request: Request):
     """
     Chat endpoint with SSE streaming.
 
@@ -59,7 +126,7 @@ async def chat(request: ChatMessage):
     Tool calls are handled internally and not exposed to the client.
     """
     return StreamingResponse(
-        generate_stream(request.message, request.session_id),
+        generate_stream(request.message, request.session_id, http_request),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -69,6 +136,17 @@ async def chat(request: ChatMessage):
     )
 
 
+@router.get("/stats")
+async def chat_stats():
+    """Stream, cancellation and token usage counters for this worker."""
+    turns = usage_stats["turns"]
+    return {
+        **stream_stats,
+        **usage_stats,
+        "avg_prompt_tokens": usage_stats["prompt_tokens"] / turns if turns else 0,
+    }
+
+
 @router.post("/sync")
 async def chat_sync(request: ChatMessage):
     """
@@ -88,6 +166,7 @@ async def chat_sync(request: ChatMessage):
         return {
             "response": tool_responses[0]["result"] if tool_responses else "",
             "tool_calls": result["tool_calls"],
+            "usage": result.get("usage"),
         }
 
-    return {"response": result.get("content", "")}
+    return {"response": result.get("content", ""), "usage": result.get("usage")}
@@ -2,7 +2,11 @@
 
 from fastapi import APIRouter
 
-from app.db import get_db
+from app.repositories import get_repository
+from app.services.dashboard import reset_dashboard
+from app.services.price_stats import clear_price_stats_cache
+from app.services.recommendations import invalidate_category_cache
+from app.services.write_buffer import discard_pending_writes, get_write_buffer
 
 router = APIRouter(prefix="/api/demo", tags=["demo"])
 
@@ -10,33 +14,22 @@ router = APIRouter(prefix="/api/demo", tags=["demo"])
 @router.post("/reset")
 async def reset_demo():
     """Reset demo by clearing tracked items and alerts."""
-    db = get_db()
+    repo = get_repository()
 
-    # Delete alerts FIRST (FK child references tracked_items)
-    db.table("alerts").delete().neq(
-        "tracked_item_id", "00000000-0000-0000-0000-000000000000"
-    ).execute()
+    # Let this worker's in-flight flush finish, then drop pending rows in
+    # every worker: they belong to tables about to be emptied
+    await get_write_buffer().flush()
+    discard_pending_writes()
+
+    # Clear alerts, tracked items and simulated price history
+    repo.clear_demo_data()
 
-    # Delete tracked_items SECOND (FK parent)
-    db.table("tracked_items").delete().neq(
-        "product_id", "00000000-0000-0000-0000-000000000000"
-    ).execute()
     # Reset ALL product prices to original values
-    # Get all products with original_price set
-    products_result = (
-        db.table("products")
-        .select("id, original_price")
-        .not_.is_("original_price", "null")
-        .execute()
-    )
-    for product in products_result.data:
-        db.table("products").update({"current_price": product["original_price"]}).eq(
-            "id", product["id"]
-        ).execute()
-
-    # Clear price history (remove simulated entries)
-    db.table("price_history").delete().neq(
-        "product_id", "00000000-0000-0000-0000-000000000000"
-    ).execute()
+    repo.reset_product_prices()
+
+    # Only now drop caches, so no worker rebuilds from half-reset tables
+    clear_price_stats_cache()
+    reset_dashboard()
+    invalidate_category_cache()
 
     return {"success": True, "message": "Demo reset complete"}
@@ -0,0 +1,38 @@
+"""Export router streaming price history and alerts."""
+
+from typing import Literal
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.services.export import export_stream
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _export_response(table: str, fmt: str, gzip: bool) -> StreamingResponse:
+    filename = f"{table}.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_stream(table, fmt, gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+    )
+
+
+@router.get("/price-history")
+async def export_price_history(
+    format: Literal["csv", "ndjson"] = "ndjson", gzip: bool = False
+):
+    """Stream all price history rows, oldest first."""
+    return _export_response("price_history", format, gzip)
+
+
+@router.get("/alerts")
+async def export_alerts(format: Literal["csv", "ndjson"] = "ndjson", gzip: bool = False):
+    """Stream all alert rows, oldest first."""
+    return _export_response("alerts", format, gzip)
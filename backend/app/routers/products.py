@@ -1,8 +1,9 @@
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from app.services.products import get_tracked_items, get_products_by_category
-from app.db import get_db
+from app.services.watchlist import import_watchlist, parse_watchlist
+from app.repositories import get_repository
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
@@ -22,6 +23,36 @@ async def list_tracked():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/tracked/bulk")
+async def bulk_track(request: Request):
+    """
+    Bulk import a watchlist without going through chat.
+
+    Accepts CSV (header: query or product_id, target_price) or NDJSON
+    (one {"query" | "product_id", "target_price"} object per line).
+    Returns a per-row result: created, duplicate, not_found, invalid or failed.
+    """
+    try:
+        rows = parse_watchlist(
+            await request.body(), request.headers.get("content-type", "")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows found in upload")
+
+    try:
+        return import_watchlist(rows)
+    except Exception as e:
+        error_msg = str(e)
+        if "Invalid API key" in error_msg or "401" in error_msg:
+            raise HTTPException(
+                status_code=503,
+                detail="Database connection unavailable. Please check Supabase credentials.",
+            )
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("")
 async def list_products(
     category: Optional[str] = None, max_price: Optional[float] = None
@@ -30,9 +61,7 @@ async def list_products(
         if category:
             products = get_products_by_category(category, max_price)
         else:
-            db = get_db()
-            result = db.table("products").select("*").execute()
-            products = result.data
+            products = get_repository().list_products()
         return {"products": products}
     except Exception as e:
         error_msg = str(e)
@@ -0,0 +1,37 @@
+"""Production entrypoint running one uvicorn worker per CPU core."""
+
+import os
+
+import uvicorn
+
+from app.config import get_settings
+from app.repositories import get_repository
+
+
+def worker_count() -> int:
+    """Configured worker count, defaulting to the cores available to us."""
+    settings = get_settings()
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def main():
+    # Create and seed a local database once, before workers open it together
+    if get_settings().storage_backend == "sqlite":
+        get_repository()
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        workers=worker_count(),
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
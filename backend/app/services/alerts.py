@@ -0,0 +1,68 @@
+"""Price change and alert paths shared by the API and the market simulator."""
+
+from typing import Optional
+
+from app.repositories import get_repository
+from app.services import dashboard
+from app.services.email import send_price_alert
+from app.services.price_stats import record_price
+from app.services.recommendations import update_category_price
+from app.services.write_buffer import get_write_buffer
+
+
+def apply_price_change(
+    product_id: str, new_price: float, old_price: Optional[float] = None
+) -> dict:
+    """
+    Set a product's price and propagate it to history, caches and stats.
+
+    Returns:
+        The deal assessment of the new price (see PriceStats.assess)
+    """
+    get_repository().update_product_price(product_id, new_price)
+    update_category_price(product_id, new_price)
+    dashboard.on_price_change(product_id, new_price)
+
+    # Add to price history (written behind)
+    get_write_buffer().append(
+        "price_history", {"product_id": product_id, "price": new_price}
+    )
+    return record_price(product_id, new_price, previous_price=old_price)
+
+
+async def trigger_alert(
+    item: dict, old_price: float, new_price: float, recipient_email: str
+) -> dict:
+    """
+    Email a price alert for a tracked item and record it.
+
+    Returns:
+        The queued alert row plus `email_error` (None on success)
+    """
+    product = item.get("products") or {}
+
+    email_sent = False
+    email_error = None
+    try:
+        email_sent = await send_price_alert(
+            to_email=recipient_email,
+            product_name=product.get("name", "Unknown Product"),
+            old_price=old_price,
+            new_price=new_price,
+            target_price=item["target_price"],
+            product_url="#",  # No real URL for POC
+        )
+    except Exception as e:
+        email_error = str(e)
+        print(f"Email send failed: {e}")
+
+    # Create alert record (written behind)
+    alert = {
+        "tracked_item_id": item["id"],
+        "old_price": old_price,
+        "new_price": new_price,
+        "email_sent": email_sent,
+    }
+    get_write_buffer().append("alerts", alert)
+    dashboard.on_alert(alert)
+    return {**alert, "email_error": email_error}
@@ -0,0 +1,163 @@
+"""Cross-worker broadcast bus over local Unix datagram sockets."""
+
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import orjson
+
+from app.config import get_settings
+
+# topic -> handlers called with the message payload
+_handlers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+_sock: Optional[socket.socket] = None
+_path: Optional[Path] = None
+
+# Seconds an ownership decision is reused before the directory is rescanned
+OWNER_CHECK_INTERVAL = 5.0
+
+# (monotonic time checked, whether this worker is the owner)
+_owner: Optional[tuple[float, bool]] = None
+
+
+def _bus_dir() -> Path:
+    """
+    Socket directory shared by this server's workers only.
+
+    Workers of one server share their parent (the uvicorn supervisor), so
+    sockets are grouped by parent pid and other app instances on the same
+    host never see each other's messages.
+    """
+    settings = get_settings()
+    root = Path(settings.bus_dir or Path(tempfile.gettempdir()) / "dealhunter-bus")
+    return root / str(os.getppid())
+
+
+def subscribe(topic: str, handler: Callable[[Any], None]) -> None:
+    """Register a handler for a topic in this process."""
+    _handlers[topic].append(handler)
+
+
+def _dispatch(topic: str, payload: Any) -> None:
+    for handler in _handlers.get(topic, []):
+        try:
+            handler(payload)
+        except Exception as e:
+            print(f"Bus handler for '{topic}' failed: {e}")
+
+
+def publish(topic: str, payload: Any = None) -> None:
+    """
+    Run a topic's handlers here and broadcast it to every other worker.
+
+    Delivery to other workers is best effort: a worker whose socket is
+    gone is pruned, and a full receive buffer drops the message.
+    """
+    global _owner
+    _dispatch(topic, payload)
+    if _sock is None:
+        return
+
+    message = orjson.dumps({"topic": topic, "payload": payload})
+    for entry in os.scandir(_path.parent):
+        if entry.path == str(_path) or not entry.name.endswith(".sock"):
+            continue
+        try:
+            _sock.sendto(message, entry.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Worker exited without cleaning up (maybe the owner)
+            Path(entry.path).unlink(missing_ok=True)
+            _owner = None
+        except (BlockingIOError, OSError) as e:
+            print(f"Bus message to {entry.name} dropped: {e}")
+            _owner = None
+
+
+def is_owner() -> bool:
+    """
+    Whether this worker is the single owner of shared state folds.
+
+    The owner is the live worker with the lowest pid, so every worker
+    agrees on it without coordination; without the bus (one process)
+    this worker is always the owner. The decision is cached for
+    OWNER_CHECK_INTERVAL and rechecked early once a send fails.
+    """
+    global _owner
+    if _sock is None:
+        return True
+
+    now = time.monotonic()
+    if _owner is None or now - _owner[0] >= OWNER_CHECK_INTERVAL:
+        _owner = (now, _has_lowest_live_pid())
+    return _owner[1]
+
+
+def _has_lowest_live_pid() -> bool:
+    pid = os.getpid()
+    for entry in os.scandir(_path.parent):
+        other = entry.name.removesuffix(".sock")
+        if not other.isdigit() or int(other) >= pid:
+            continue
+        try:
+            os.kill(int(other), 0)
+        except ProcessLookupError:
+            continue
+        except PermissionError:
+            pass
+        return False
+    return True
+
+
+def _on_readable() -> None:
+    while True:
+        try:
+            data = _sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        try:
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            continue
+        # Ignore anything that isn't one of our messages
+        if isinstance(message, dict) and isinstance(message.get("topic"), str):
+            _dispatch(message["topic"], message.get("payload"))
+
+
+def start() -> None:
+    """Bind this worker's socket and listen on the running event loop."""
+    global _sock, _path
+    if _sock is not None or not hasattr(socket, "AF_UNIX"):
+        return
+
+    bus_dir = _bus_dir()
+    bus_dir.mkdir(parents=True, exist_ok=True)
+    _path = bus_dir / f"{os.getpid()}.sock"
+    _path.unlink(missing_ok=True)
+
+    _sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    _sock.bind(str(_path))
+    _sock.setblocking(False)
+    asyncio.get_running_loop().add_reader(_sock.fileno(), _on_readable)
+
+
+def stop() -> None:
+    """Stop listening and remove this worker's socket."""
+    global _sock, _path, _owner
+    if _sock is None:
+        return
+
+    asyncio.get_running_loop().remove_reader(_sock.fileno())
+    _sock.close()
+    _path.unlink(missing_ok=True)
+    try:
+        # Last worker out removes the server's directory
+        _path.parent.rmdir()
+    except OSError:
+        pass
+    _sock, _path, _owner = None, None, None
@@ -0,0 +1,131 @@
+"""Denormalized per-user dashboard snapshot, maintained incrementally."""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.repositories import DEFAULT_EMAIL, get_repository
+from app.services import bus
+
+# Snapshots older than this are rebuilt, in case an event was lost
+# without a later one from the same worker to reveal the gap
+SNAPSHOT_MAX_AGE = 300.0
+
+# email -> tracked_item_id -> entry; None until built in this worker
+_snapshots: Optional[dict[str, dict[str, dict]]] = None
+_built_at = 0.0
+
+# product_id -> tracked_item_id -> the same entries, for price updates
+_by_product: dict[str, dict[str, dict]] = {}
+
+# Sequence number of the last event this worker published
+_seq = 0
+
+# Last event sequence number seen from each publishing worker (by pid)
+_last_seen: dict[int, int] = {}
+
+
+def _entry(item: dict) -> dict:
+    """Build a snapshot entry from a tracked item read with list_tracked_items."""
+    entry = dict(item)
+    product = item.get("products")
+    entry["delta_to_target"] = (
+        round(product["current_price"] - item["target_price"], 2)
+        if product
+        else None
+    )
+    return entry
+
+
+def _add(
+    snapshots: dict[str, dict[str, dict]],
+    by_product: dict[str, dict[str, dict]],
+    items: list[dict],
+) -> None:
+    for item in items:
+        entry = _entry(item)
+        email = item.get("email") or DEFAULT_EMAIL
+        snapshots.setdefault(email, {})[item["id"]] = entry
+        if entry.get("products"):
+            by_product.setdefault(entry["products"]["id"], {})[item["id"]] = entry
+
+
+def get_dashboard(email: str = DEFAULT_EMAIL) -> list[dict]:
+    """Get a user's tracked items with current price, delta and latest alert."""
+    global _snapshots, _by_product, _built_at
+    if _snapshots is None or time.monotonic() - _built_at > SNAPSHOT_MAX_AGE:
+        _built_at = time.monotonic()
+        snapshots: dict[str, dict[str, dict]] = {}
+        by_product: dict[str, dict[str, dict]] = {}
+        _add(snapshots, by_product, get_repository().list_tracked_items())
+        _snapshots, _by_product = snapshots, by_product
+    return list(_snapshots.get(email, {}).values())
+
+
+def _apply(event: dict) -> None:
+    """Apply a write event to this worker's snapshots (if built)."""
+    global _snapshots
+    # Delivery is best effort: a gap in a worker's sequence means an event
+    # was lost, so the snapshot is dropped and rebuilt on the next read
+    last = _last_seen.get(event["origin"])
+    _last_seen[event["origin"]] = event["seq"]
+    if event["op"] == "reset" or (last is not None and event["seq"] != last + 1):
+        _snapshots = None
+    if _snapshots is None:
+        return
+
+    if event["op"] == "tracked":
+        # Events carry ids only; the rows are read back here
+        try:
+            items = get_repository().list_tracked_items(event["ids"])
+        except Exception as e:
+            print(f"Dashboard snapshot dropped, tracked items unreadable: {e}")
+            _snapshots = None
+            return
+        _add(_snapshots, _by_product, items)
+
+    elif event["op"] == "price":
+        for entry in _by_product.get(event["product_id"], {}).values():
+            entry["products"]["current_price"] = event["price"]
+            entry["delta_to_target"] = round(event["price"] - entry["target_price"], 2)
+
+    elif event["op"] == "alert":
+        for items in _snapshots.values():
+            entry = items.get(event["tracked_item_id"])
+            if entry:
+                entry["latest_alert"] = event["alert"]
+
+
+bus.subscribe("dashboard", _apply)
+
+
+def _publish(event: dict) -> None:
+    """Publish an event stamped with this worker's next sequence number."""
+    global _seq
+    _seq += 1
+    bus.publish("dashboard", {**event, "origin": os.getpid(), "seq": _seq})
+
+
+def on_items_tracked(item_ids: list[str]) -> None:
+    """Add newly created tracked items (rows must already be written)."""
+    if item_ids:
+        _publish({"op": "tracked", "ids": item_ids})
+
+
+def on_price_change(product_id: str, price: float) -> None:
+    """Update current price and delta on every item tracking the product."""
+    _publish({"op": "price", "product_id": product_id, "price": price})
+
+
+def on_alert(alert: dict) -> None:
+    """Set an alert as its tracked item's latest alert."""
+    alert = {"created_at": datetime.now(timezone.utc).isoformat(), **alert}
+    _publish(
+        {"op": "alert", "tracked_item_id": alert["tracked_item_id"], "alert": alert}
+    )
+
+
+def reset_dashboard() -> None:
+    """Drop all snapshots (rebuilt on next read)."""
+    _publish({"op": "reset"})
@@ -29,6 +29,10 @@ async def send_price_alert(
     Returns:
         True if email sent successfully, False otherwise
     """
+    if settings.email_backend == "log":
+        # Stand-in backend: accept the handoff without sending anything
+        return True
+
     savings = old_price - new_price
 
     html_content = f"""
@@ -0,0 +1,75 @@
+"""Streaming CSV/NDJSON export of append-only tables."""
+
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator
+
+import orjson
+
+from app.repositories import get_repository
+
+# Rows fetched per keyset page
+EXPORT_PAGE_SIZE = 1000
+
+# Column order per exportable table
+EXPORT_COLUMNS = {
+    "price_history": ["id", "product_id", "price", "created_at"],
+    "alerts": [
+        "id",
+        "tracked_item_id",
+        "old_price",
+        "new_price",
+        "email_sent",
+        "created_at",
+    ],
+}
+
+
+def iter_pages(table: str, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[list[dict]]:
+    """Yield a table in keyset pages, holding one page in memory at a time."""
+    repo = get_repository()
+    after = None
+    while True:
+        page = repo.page_rows(table, after, page_size)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after = (page[-1]["created_at"], page[-1]["id"])
+
+
+def encode_csv(table: str, pages: Iterable[list[dict]]) -> Iterator[bytes]:
+    """Encode pages as CSV, one chunk per page after the header."""
+    columns = EXPORT_COLUMNS[table]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    for page in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(page)
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(pages: Iterable[list[dict]]) -> Iterator[bytes]:
+    """Encode pages as NDJSON, one chunk per page."""
+    for page in pages:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in page)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a chunk stream, flushing per chunk so bytes keep flowing."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def export_stream(table: str, fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    """Build the export pipeline: keyset pages -> encoder -> optional gzip."""
+    pages = iter_pages(table)
+    chunks = encode_csv(table, pages) if fmt == "csv" else encode_ndjson(pages)
+    return gzip_chunks(chunks) if gzip else chunks
@@ -2,17 +2,35 @@
 
 import json
 from typing import Any
-from openai import AsyncOpenAI  # type: ignore
-from app.config import get_settings
+from app.services.openai_client import create_completion
 from app.services.products import (
     search_products,
-    get_products_by_category,
     create_tracked_item,
     get_tracked_items,
 )
+from app.services.price_stats import assess_prices
+from app.services.recommendations import get_recommendations
 
-settings = get_settings()
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+# Completion token cap per chat turn
+MAX_TOKENS = 500
+
+# Character budget for a tool result (fits a full list of tracked items)
+TOOL_RESULT_BUDGET = 1200
+
+# Tracked items listed by the list tool (closest to target first)
+MAX_LISTED_ITEMS = 10
+
+# Per-process token usage across chat turns (see GET /api/chat/stats)
+usage_stats = {
+    "turns": 0,
+    "prompt_tokens": 0,
+    "cached_prompt_tokens": 0,
+    "completion_tokens": 0,
+}
+
+# SYSTEM_PROMPT and TOOLS form the static prompt prefix the provider caches.
+# Keep them byte-stable and first in every request; per-turn data (history,
+# tool results, the user message) only ever goes after them.
 
 # System prompt with guardrails
 SYSTEM_PROMPT = """You are DealHunter, a product deal tracking assistant.
@@ -103,7 +121,8 @@ async def process_message(
     """
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
 
-    # Add conversation history if provided
+    # Add conversation history if provided (tool results are compacted
+    # by get_tool_response already)
     if conversation_history:
         messages.extend(conversation_history)
 
@@ -111,12 +130,12 @@ async def process_message(
     messages.append({"role": "user", "content": message})
 
     try:
-        response = await client.chat.completions.create(
+        response = await create_completion(
             model="gpt-4o-mini",  # Cost-effective for POC
             messages=messages,
             tools=TOOLS,
             tool_choice="auto",
-            max_tokens=500,
+            max_tokens=MAX_TOKENS,
             temperature=0.7,
         )
 
@@ -126,6 +145,7 @@ async def process_message(
             "content": assistant_message.content or "",
             "tool_calls": None,
             "finish_reason": response.choices[0].finish_reason,
+            "usage": _record_usage(response.usage),
         }
 
         # Extract tool calls if present
@@ -149,11 +169,63 @@ async def process_message(
         }
 
 
+def _record_usage(usage) -> dict:
+    """Add a completion's token usage to usage_stats and return it."""
+    if usage is None:
+        return {}
+    details = getattr(usage, "prompt_tokens_details", None)
+    turn = {
+        "prompt_tokens": usage.prompt_tokens,
+        "cached_prompt_tokens": getattr(details, "cached_tokens", 0) or 0,
+        "completion_tokens": usage.completion_tokens,
+    }
+    usage_stats["turns"] += 1
+    for key, value in turn.items():
+        usage_stats[key] += value
+    return turn
+
+
+def compact_tool_result(text: str, budget: int = TOOL_RESULT_BUDGET) -> str:
+    """
+    Shrink a tool result to at most `budget` characters.
+
+    Whitespace is collapsed per line, and longer results are cut at a line
+    boundary with a note of how many lines were dropped, room for which is
+    kept within the budget (a first line that alone is over budget is cut
+    short with an ellipsis).
+    """
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    compact = "\n".join(lines)
+    if len(compact) <= budget:
+        return compact
+
+    # Sized for the most lines that could be dropped
+    room = budget - len(f"\n(+{len(lines)} more lines truncated)")
+    if room < 2:
+        return compact[: budget - 1] + "…"
+
+    kept, size = [], -1
+    for line in lines:
+        if size + len(line) + 1 > room:
+            break
+        kept.append(line)
+        size += len(line) + 1
+    if not kept:
+        kept.append(lines[0][: room - 1] + "…")
+    return "\n".join(kept) + f"\n(+{len(lines) - len(kept)} more lines truncated)"
+
+
 async def get_tool_response(tool_name: str, tool_args: dict) -> str:
     """
     Execute a tool and return the result as a string for the LLM.
-    Connects to Supabase for actual data operations.
+    Results are compacted to TOOL_RESULT_BUDGET characters.
     """
+    return compact_tool_result(await _run_tool(tool_name, tool_args))
+
+
+async def _run_tool(tool_name: str, tool_args: dict) -> str:
+    """Execute a tool against the configured repository."""
     try:
         if tool_name == "track_product":
             product_name = tool_args["product_name"]
@@ -179,7 +251,7 @@ async def get_tool_response(tool_name: str, tool_args: dict) -> str:
             category = tool_args.get("category", "Electronics")
             max_price = tool_args.get("max_price")
 
-            products = get_products_by_category(category, max_price)
+            products = get_recommendations(category, max_price)
 
             if not products:
                 return (
@@ -189,7 +261,11 @@ async def get_tool_response(tool_name: str, tool_args: dict) -> str:
                 )
 
             product_list = "\n".join(
-                [f"- {p['name']}: ${p['current_price']:.2f}" for p in products]
+                [
+                    f"- {p['name']}: ${p['current_price']:.2f}"
+                    + (f" ({p['discount']:.0%} off)" if p["discount"] else "")
+                    for p in products
+                ]
             )
             return f"Here are some {category} deals:\n{product_list}"
 
@@ -199,13 +275,32 @@ async def get_tool_response(tool_name: str, tool_args: dict) -> str:
             if not items:
                 return "You're not tracking any products yet. Try saying 'Track [product name] under $[price]' to get started!"
 
+            # Only the items closest to their target are listed
+            listed = sorted(
+                (item for item in items if item.get("products")),
+                key=lambda item: abs(item.get("delta_to_target") or 0.0),
+            )[:MAX_LISTED_ITEMS]
+            deals = assess_prices(
+                {
+                    item["products"]["id"]: item["products"]["current_price"]
+                    for item in listed
+                }
+            )
             item_list = "\n".join(
                 [
-                    f"- {item['products']['name']}: watching for ${item['target_price']:.2f} (currently ${item['products']['current_price']:.2f})"
-                    for item in items
-                    if item.get("products")
+                    f"- {item['products']['name']}: watching for ${item['target_price']:.2f} (currently ${item['products']['current_price']:.2f}"
+                    + (
+                        ", all-time low"
+                        if deals.get(item["products"]["id"], {}).get("all_time_low")
+                        else ""
+                    )
+                    + ")"
+                    for item in listed
                 ]
             )
+            more = len(items) - len(listed)
+            if more > 0:
+                item_list += f"\n...and {more} more."
             return f"You're currently tracking:\n{item_list}"
 
         return "Unknown tool"
@@ -0,0 +1,139 @@
+"""Shared OpenAI client with deadlines, jittered retries and hedging."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from functools import lru_cache
+
+import httpx
+import openai
+from openai import AsyncOpenAI  # type: ignore
+
+from app.config import get_settings
+
+# Errors worth another attempt
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+# Backoff bounds for retries (full jitter between 0 and the bound)
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 4.0
+
+# First-attempt latency samples kept for the hedging threshold
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+MIN_HEDGE_DELAY = 1.0
+
+_latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+
+@lru_cache()
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get the process-wide OpenAI client.
+
+    One HTTP/2 connection pool with keep-alive is shared by every chat
+    turn. Retries are handled by `create_completion`, not the SDK.
+    """
+    settings = get_settings()
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=60
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.llm_connect_timeout,
+            read=settings.llm_request_budget,
+            write=10.0,
+            pool=settings.llm_connect_timeout,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key, http_client=http_client, max_retries=0
+    )
+
+
+def p95_latency() -> float | None:
+    """p95 of recent first-attempt latencies, once enough are seen."""
+    if len(_latencies) < MIN_HEDGE_SAMPLES:
+        return None
+    ordered = sorted(_latencies)
+    return ordered[int(len(ordered) * 0.95) - 1]
+
+
+async def _hedged_create(**kwargs):
+    """
+    Send a request, and a second one if the first outlives the p95.
+
+    Only the first request's latency is recorded, since hedges are the fast
+    tail by construction. A first request that loses to its hedge is
+    recorded at its elapsed time when the hedge wins (a lower bound), so
+    slow requests stay in the window and the p95 doesn't drift down.
+    Requests that fail or are cancelled from outside are not recorded.
+    """
+    create = get_openai_client().chat.completions.create
+    p95 = p95_latency()
+    start = time.monotonic()
+    first = asyncio.ensure_future(create(**kwargs))
+    tasks = {first}
+    try:
+        if p95 is None:
+            response = await first
+            _latencies.append(time.monotonic() - start)
+            return response
+
+        done, _ = await asyncio.wait(tasks, timeout=max(p95, MIN_HEDGE_DELAY))
+        if done:
+            response = first.result()
+            _latencies.append(time.monotonic() - start)
+            return response
+
+        tasks.add(asyncio.ensure_future(create(**kwargs)))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is first or not first.done():
+                        _latencies.append(time.monotonic() - start)
+                    return task.result()
+        # Both failed - surface the first request's error
+        return first.result()
+    finally:
+        # Also reached when the caller's deadline cancels us
+        for task in tasks:
+            task.cancel()
+
+
+async def create_completion(**kwargs):
+    """
+    Create a chat completion within the configured request budget.
+
+    Retryable errors are retried with full-jitter exponential backoff
+    while budget remains; slow requests are hedged past the observed p95.
+    """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.llm_request_budget
+    attempt = 0
+
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            return await asyncio.wait_for(_hedged_create(**kwargs), remaining)
+        except RETRYABLE_ERRORS as e:
+            attempt += 1
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+            if (
+                attempt > settings.llm_max_retries
+                or time.monotonic() + delay >= deadline
+            ):
+                raise
+            print(f"OpenAI request failed ({e}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,217 @@
+"""Incremental rolling price statistics per product."""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.repositories import get_repository
+from app.services import bus
+from app.services.write_buffer import get_write_buffer
+
+# Smoothing factor for the exponentially weighted mean/variance
+EWMA_ALPHA = 0.2
+
+# Window for the rolling minimum, kept as one minimum per day
+ROLLING_WINDOW_DAYS = 30
+DAY_SECONDS = 86400
+
+# Prices this many standard deviations below the EWMA count as a real deal
+DEAL_ZSCORE = -1.5
+
+# product_id -> stats; authoritative on the owning worker (see bus.is_owner),
+# a read-through copy of the persisted rows everywhere else
+_stats_cache: dict[str, "PriceStats"] = {}
+
+
+@dataclass
+class PriceStats:
+    """
+    Rolling statistics updated in constant time per price point.
+
+    The rolling minimum is kept as [day, lowest price that day] buckets,
+    oldest first, so the window never holds more than ROLLING_WINDOW_DAYS
+    entries however often prices tick, and the persisted stats stay small.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    var: float = 0.0
+    all_time_low: Optional[float] = None
+    window: list = field(default_factory=list)
+
+    @property
+    def rolling_min(self) -> Optional[float]:
+        return min(price for _, price in self.window) if self.window else None
+
+    def update(self, price: float, at: Optional[float] = None) -> None:
+        """Fold a new price point into the statistics."""
+        at = time.time() if at is None else at
+
+        if self.count == 0:
+            self.mean, self.var = price, 0.0
+        else:
+            diff = price - self.mean
+            incr = EWMA_ALPHA * diff
+            self.mean += incr
+            self.var = (1 - EWMA_ALPHA) * (self.var + diff * incr)
+        self.count += 1
+
+        if self.all_time_low is None or price < self.all_time_low:
+            self.all_time_low = price
+
+        day = int(at // DAY_SECONDS)
+        if self.window and day <= self.window[-1][0]:
+            # Same day (or a late point from a skewed clock)
+            self.window[-1][1] = min(self.window[-1][1], price)
+        else:
+            self.window.append([day, price])
+        first_day = day - ROLLING_WINDOW_DAYS + 1
+        while self.window[0][0] < first_day:
+            self.window.pop(0)
+
+    def assess(self, price: float) -> dict:
+        """Judge a price against the statistics gathered so far."""
+        std = math.sqrt(self.var)
+        zscore = (price - self.mean) / std if std > 0 else 0.0
+        all_time_low = self.all_time_low is not None and price <= self.all_time_low
+        return {
+            "all_time_low": all_time_low,
+            "rolling_min": self.rolling_min,
+            "ewma": round(self.mean, 2) if self.count else None,
+            "zscore": round(zscore, 2),
+            "real_deal": all_time_low or zscore <= DEAL_ZSCORE,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "var": self.var,
+            "all_time_low": self.all_time_low,
+            "window": [list(bucket) for bucket in self.window],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PriceStats":
+        return cls(**{**data, "window": _day_buckets(data.get("window", []))})
+
+
+def _day_buckets(window: list) -> list:
+    """Read a persisted window, folding older [timestamp, price] points by day."""
+    buckets: list = []
+    for at, price in window:
+        day = int(at // DAY_SECONDS) if at > DAY_SECONDS else int(at)
+        if buckets and buckets[-1][0] == day:
+            buckets[-1][1] = min(buckets[-1][1], price)
+        else:
+            buckets.append([day, price])
+    return buckets
+
+
+def get_price_stats(product_ids: list[str]) -> dict[str, PriceStats]:
+    """Get stats for products, reading only the ones not cached yet."""
+    missing = [pid for pid in product_ids if pid not in _stats_cache]
+    if missing:
+        for pid, data in get_repository().get_price_stats(missing).items():
+            _stats_cache[pid] = PriceStats.from_dict(data)
+    return {pid: _stats_cache[pid] for pid in product_ids if pid in _stats_cache}
+
+
+def assess_prices(prices: dict[str, float]) -> dict[str, dict]:
+    """Assess current prices by product id (none assessed if stats are unavailable)."""
+    try:
+        stats = get_price_stats(list(prices))
+    except Exception as e:
+        print(f"Price stats unavailable: {e}")
+        return {}
+    return {
+        pid: stats[pid].assess(price) for pid, price in prices.items() if pid in stats
+    }
+
+
+def record_price(
+    product_id: str, price: float, previous_price: Optional[float] = None
+) -> dict:
+    """
+    Assess a new price against a product's stats and fold it in.
+
+    The price point is broadcast and only the owning worker folds it into
+    the stats and persists them (written behind), so concurrent ticks on
+    different workers never overwrite each other's updates. `previous_price`
+    seeds the stats of a product seen for the first time, so the first
+    recorded drop is judged against the price it dropped from.
+
+    Stats are an enhancement: if they can't be read, the price is assessed
+    against empty stats (no deal flags) and the change goes ahead.
+
+    Returns:
+        The assessment of `price` against the stats before this update
+    """
+    try:
+        stats = get_price_stats([product_id]).get(product_id)
+    except Exception as e:
+        print(f"Price stats unavailable: {e}")
+        return PriceStats().assess(price)
+    if stats is None:
+        stats = PriceStats()
+        if previous_price is not None:
+            stats.update(previous_price)
+    assessment = stats.assess(price)
+
+    bus.publish(
+        "price_point",
+        {
+            "product_id": product_id,
+            "price": price,
+            "previous_price": previous_price,
+            "at": time.time(),
+        },
+    )
+    return assessment
+
+
+def _fold(point: dict) -> None:
+    """Fold a price point into the stats on the owning worker."""
+    if not bus.is_owner():
+        return
+
+    product_id = point["product_id"]
+    try:
+        stats = get_price_stats([product_id]).get(product_id) or PriceStats()
+    except Exception as e:
+        # Folding into empty stats would overwrite the stored ones
+        print(f"Skipping price stats update for {product_id}: {e}")
+        return
+    if stats.count == 0 and point["previous_price"] is not None:
+        stats.update(point["previous_price"], point["at"])
+    stats.update(point["price"], point["at"])
+    _stats_cache[product_id] = stats
+    get_write_buffer().append(
+        "price_stats", {"product_id": product_id, "stats": stats.to_dict()}
+    )
+
+
+def _on_flush(table: str, rows: list[dict]) -> None:
+    if table == "price_stats":
+        # Other workers reload these products' stats on next use
+        bus.publish("price_stats", list({row["product_id"] for row in rows}))
+
+
+def clear_price_stats_cache() -> None:
+    """Drop cached stats in every worker (call after stored stats are cleared)."""
+    bus.publish("price_stats")
+
+
+def _evict(product_ids: Optional[list[str]]) -> None:
+    if product_ids is None:
+        _stats_cache.clear()
+    elif not bus.is_owner():
+        # The owner's copy is newer than the persisted rows
+        for product_id in product_ids:
+            _stats_cache.pop(product_id, None)
+
+
+bus.subscribe("price_point", _fold)
+bus.subscribe("price_stats", _evict)
+get_write_buffer().add_flush_listener(_on_flush)
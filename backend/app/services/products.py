@@ -2,84 +2,187 @@
 
 from typing import Optional
 from uuid import UUID
-from app.db import get_db
+from app.repositories import DEFAULT_EMAIL, get_repository
+from app.services import dashboard
 
-# Default email for POC (single user)
-DEFAULT_EMAIL = "alerts@kliuiev.com"
+# Words ignored when matching product names
+SKIP_WORDS = {"inch", "inches", "the", "a", "an", "for", "with"}
+
+# Max rows per multi-row insert
+INSERT_CHUNK_SIZE = 500
+
+
+def _search_words(name: str) -> list[str]:
+    """Split a product query into the words used for matching."""
+    return [w for w in name.split() if w.lower() not in SKIP_WORDS]
 
 
 def search_products(name: str, limit: int = 5) -> list[dict]:
     """Search products by name (case-insensitive partial match)."""
-    db = get_db()
-    skip_words = {"inch", "inches", "the", "a", "an", "for", "with"}
-    words = [w for w in name.split() if w.lower() not in skip_words]
+    repo = get_repository()
+    words = _search_words(name)
 
     if len(words) > 1:
         pattern = "%" + "%".join(words) + "%"
     else:
         pattern = f"%{name}%"
 
-    result = (
-        db.table("products").select("*").ilike("name", pattern).limit(limit).execute()
-    )
+    products = repo.search_products(pattern, limit)
 
-    if not result.data and len(words) > 1:
+    if not products and len(words) > 1:
         for word in words:
             if len(word) > 2:
-                result = (
-                    db.table("products")
-                    .select("*")
-                    .ilike("name", f"%{word}%")
-                    .limit(limit)
-                    .execute()
-                )
-                if result.data:
+                products = repo.search_products(f"%{word}%", limit)
+                if products:
                     break
 
-    return result.data
+    return products
 
 
 def get_products_by_category(
     category: str, max_price: Optional[float] = None, limit: int = 5
 ) -> list[dict]:
     """Get products by category with optional max price filter."""
-    db = get_db()
-    query = db.table("products").select("*").ilike("category", f"%{category}%")
-    if max_price:
-        query = query.lte("current_price", max_price)
-    result = query.limit(limit).execute()
-    return result.data
+    return get_repository().get_products_by_category(category, max_price, limit)
 
 
 def create_tracked_item(
     product_id: UUID, target_price: float, email: str = DEFAULT_EMAIL
 ) -> dict:
     """Create a tracked item for a product."""
-    db = get_db()
-    result = (
-        db.table("tracked_items")
-        .insert(
-            {
-                "product_id": str(product_id),
-                "target_price": target_price,
-            }
-        )
-        .execute()
+    created = get_repository().insert_tracked_items(
+        [{"product_id": str(product_id), "target_price": target_price}]
     )
-    return result.data[0] if result.data else {}
+    dashboard.on_items_tracked([item["id"] for item in created])
+    return created[0] if created else {}
+
+
+class _NameIndex:
+    """
+    Word index over a product catalog for matching many name queries.
+
+    Matches the same product `search_products` would (first in catalog
+    order), but each query only checks the products sharing a word with
+    it instead of scanning the whole catalog.
+    """
+
+    def __init__(self, catalog: list[dict]):
+        self.catalog = catalog
+        self.names = [p["name"].lower() for p in catalog]
+        # name word -> positions of the products containing it
+        self._words: dict[str, list[int]] = {}
+        for position, name in enumerate(self.names):
+            for word in set(name.split()):
+                self._words.setdefault(word, []).append(position)
+        self._containing: dict[str, list[int]] = {}
+
+    def containing(self, part: str) -> list[int]:
+        """Positions of products whose name contains `part`, in order."""
+        if part not in self._containing:
+            if any(c.isspace() for c in part):
+                found = [i for i, name in enumerate(self.names) if part in name]
+            else:
+                # A part without spaces can only sit inside a single word
+                positions: set[int] = set()
+                for word, word_positions in self._words.items():
+                    if part in word:
+                        positions.update(word_positions)
+                found = sorted(positions)
+            self._containing[part] = found
+        return self._containing[part]
+
+    def match(self, name: str) -> Optional[dict]:
+        """Match a query the same way search_products does."""
+        words = [w.lower() for w in _search_words(name)]
+        if len(words) <= 1:
+            words = [name.lower()]
+
+        def in_order(product_name: str) -> bool:
+            pos = 0
+            for part in words:
+                pos = product_name.find(part, pos)
+                if pos < 0:
+                    return False
+                pos += len(part)
+            return True
+
+        candidates = set(self.containing(words[0]))
+        for word in words[1:]:
+            candidates.intersection_update(self.containing(word))
+        for position in sorted(candidates):
+            if in_order(self.names[position]):
+                return self.catalog[position]
+
+        if len(words) > 1:
+            for word in words:
+                if len(word) > 2:
+                    found = self.containing(word)
+                    if found:
+                        return self.catalog[found[0]]
+        return None
+
+
+def resolve_products(
+    product_ids: list[str], queries: list[str]
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """
+    Resolve product ids and name queries in bulk instead of per row.
+
+    Returns:
+        (products by id, products by query) - unresolved entries are omitted
+    """
+    repo = get_repository()
+    by_id: dict[str, dict] = {}
+    by_query: dict[str, dict] = {}
+
+    # Chunk id lookups to keep the query string bounded
+    unique_ids = list(set(product_ids))
+    for start in range(0, len(unique_ids), INSERT_CHUNK_SIZE):
+        chunk = unique_ids[start : start + INSERT_CHUNK_SIZE]
+        by_id.update({p["id"]: p for p in repo.get_products_by_ids(chunk)})
+
+    if queries:
+        index = _NameIndex(repo.list_products())
+        for query in set(queries):
+            product = index.match(query)
+            if product:
+                by_query[query] = product
+
+    return by_id, by_query
+
+
+def create_tracked_items(rows: list[dict]) -> list[dict]:
+    """Create tracked items with chunked multi-row inserts."""
+    repo = get_repository()
+    created = []
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = [
+            {"product_id": str(r["product_id"]), "target_price": r["target_price"]}
+            for r in rows[start : start + INSERT_CHUNK_SIZE]
+        ]
+        inserted = repo.insert_tracked_items(chunk)
+        dashboard.on_items_tracked([item["id"] for item in inserted])
+        created.extend(inserted)
+    return created
+
+
+def get_tracked_product_ids(product_ids: list[str]) -> set[str]:
+    """Get which of the given products are already being tracked."""
+    repo = get_repository()
+    unique_ids = list(set(product_ids))
+    tracked: set[str] = set()
+    # Chunked like the id lookups to keep the query string bounded
+    for start in range(0, len(unique_ids), INSERT_CHUNK_SIZE):
+        chunk = unique_ids[start : start + INSERT_CHUNK_SIZE]
+        tracked |= repo.list_tracked_product_ids(chunk)
+    return tracked
 
 
 def get_tracked_items(email: str = DEFAULT_EMAIL) -> list[dict]:
-    """Get all tracked items with product details."""
-    db = get_db()
-    result = db.table("tracked_items").select("*, products(*)").execute()
-    return result.data
+    """Get all tracked items with product details, from the dashboard snapshot."""
+    return dashboard.get_dashboard(email)
 
 
 def get_product_by_id(product_id: UUID) -> Optional[dict]:
     """Get a single product by ID."""
-    db = get_db()
-    result = (
-        db.table("products").select("*").eq("id", str(product_id)).single().execute()
-    )
-    return result.data
+    return get_repository().get_product(str(product_id))
@@ -0,0 +1,168 @@
+"""On-demand sampling profiler with per-route attribution."""
+
+import os
+import signal
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+# Innermost functions of a main thread that is waiting rather than running
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_wait_for_tstate_lock", "accept"}
+
+# Label for samples taken outside any request
+UNATTRIBUTED = "(no request)"
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware marking request frames for the sampler.
+
+    Its own `__call__` frame is on the stack whenever request code runs,
+    which is how samples are attributed to routes. It also counts
+    finished requests for sessions limited to the next N requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session = _session
+            if session is not None:
+                session.request_finished(_route_label(scope))
+
+
+_MIDDLEWARE_CODE = ProfilerMiddleware.__call__.__code__
+
+
+def _route_label(scope: dict) -> str:
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', scope['path'])}"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def profiler_available() -> bool:
+    """Signal-based sampling needs POSIX interval timers."""
+    return hasattr(signal, "setitimer")
+
+
+class ProfileSession:
+    """
+    A sampling run bounded by time and optionally by request count.
+
+    Samples come from a SIGPROF interval timer, which fires on consumed CPU
+    time and interrupts the main thread (the event loop) between bytecodes.
+    Idle time costs nothing, and samples aren't biased towards the points
+    where the loop releases the GIL, as a sampler thread's would be.
+    """
+
+    def __init__(
+        self,
+        duration: float,
+        interval: float,
+        route: Optional[str] = None,
+        max_requests: Optional[int] = None,
+    ):
+        self.duration = duration
+        self.interval = interval
+        self.route = route
+        self.max_requests = max_requests
+        self.requests = 0
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self.routes: Counter[str] = Counter()
+        self.done = threading.Event()
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._previous_handler = None
+
+    def _matches(self, route: str) -> bool:
+        return self.route is None or self.route in route
+
+    def request_finished(self, route: str) -> None:
+        if self.max_requests is None or not self._matches(route):
+            return
+        self.requests += 1
+        if self.requests >= self.max_requests:
+            self.done.set()
+
+    def _on_sample(self, signum, frame) -> None:
+        if frame is None or frame.f_code.co_name in IDLE_FUNCTIONS:
+            return
+
+        stack = []
+        route = UNATTRIBUTED
+        while frame is not None:
+            if frame.f_code is _MIDDLEWARE_CODE and route == UNATTRIBUTED:
+                scope = frame.f_locals.get("scope")
+                if scope:
+                    route = _route_label(scope)
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+
+        if self.route is not None and not self._matches(route):
+            return
+        stack.append(route)
+        self.stacks[";".join(reversed(stack))] += 1
+        self.routes[route] += 1
+        self.samples += 1
+
+    def start(self) -> None:
+        """Install the timer (must be called from the main thread)."""
+        self.started_at = time.monotonic()
+        self._previous_handler = signal.signal(signal.SIGPROF, self._on_sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self.elapsed = time.monotonic() - self.started_at
+        self.done.set()
+
+    def collapsed(self) -> str:
+        """Collapsed-stack output ("route;outer;...;inner count" per line)."""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common()
+        )
+
+    def summary(self) -> dict:
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "interval": self.interval,
+            "route": self.route,
+            "requests": self.requests,
+            "samples": self.samples,
+            "routes": dict(self.routes.most_common()),
+        }
+
+
+# The running session, if any (one per worker)
+_session: Optional[ProfileSession] = None
+
+
+def start_session(session: ProfileSession) -> bool:
+    """Start a session unless one is already running."""
+    global _session
+    if _session is not None:
+        return False
+    _session = session
+    session.start()
+    return True
+
+
+def end_session(session: ProfileSession) -> None:
+    """Stop a session and release the profiler."""
+    global _session
+    session.stop()
+    if _session is session:
+        _session = None
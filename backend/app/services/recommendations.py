@@ -0,0 +1,158 @@
+"""Deal recommendations ranked by discount and recent price trend."""
+
+import heapq
+import time
+from typing import Optional
+
+from app.repositories import get_repository
+from app.services import bus
+from app.services.price_stats import DAY_SECONDS, get_price_stats
+
+# How long a category slice stays cached
+CATEGORY_CACHE_TTL = 60.0
+
+# Days of price stats used for the trend signal
+TREND_WINDOW_DAYS = 14
+
+# Weight of the recent price trend relative to the discount
+TREND_WEIGHT = 0.5
+
+# Candidates (per requested result) re-ranked with price history
+CANDIDATE_FACTOR = 4
+
+# category -> (expires_at, products sorted by discount best first, products by id)
+_category_cache: dict[str, tuple[float, list[dict], dict[str, dict]]] = {}
+
+# Cached categories with a patched price, re-sorted on their next read
+_unsorted: set[str] = set()
+
+
+def invalidate_category_cache() -> None:
+    """Drop cached category slices in every worker (after bulk price changes)."""
+    bus.publish("category_cache")
+
+
+def update_category_price(product_id: str, price: float) -> None:
+    """Patch one product's price into the cached slices of every worker."""
+    bus.publish("category_cache", {"product_id": product_id, "price": price})
+
+
+def _on_category_event(event: Optional[dict]) -> None:
+    if event is None:
+        _category_cache.clear()
+        _unsorted.clear()
+        return
+    for key, (_, _, by_id) in _category_cache.items():
+        product = by_id.get(event["product_id"])
+        if product:
+            product["current_price"] = event["price"]
+            _unsorted.add(key)
+
+
+bus.subscribe("category_cache", _on_category_event)
+
+
+def _category_slice(category: str) -> list[dict]:
+    """Get all products in a category sorted by discount, cached for a TTL."""
+    key = category.lower()
+    now = time.monotonic()
+    cached = _category_cache.get(key)
+    if cached and cached[0] > now:
+        if key in _unsorted:
+            # Nearly sorted after a few patched prices, so this is cheap
+            cached[1].sort(key=discount, reverse=True)
+            _unsorted.discard(key)
+        return cached[1]
+
+    products = get_repository().list_category_products(category, None)
+    products.sort(key=discount, reverse=True)
+    _category_cache[key] = (
+        now + CATEGORY_CACHE_TTL,
+        products,
+        {p["id"]: p for p in products},
+    )
+    _unsorted.discard(key)
+    return products
+
+
+def discount(product: dict) -> float:
+    """Fractional discount of the current price versus original_price."""
+    original = product.get("original_price")
+    current = product.get("current_price")
+    if not original or current is None or current >= original:
+        return 0.0
+    return (original - current) / original
+
+
+def _trends(products: list[dict]) -> dict[str, float]:
+    """
+    Fractional price drop over the trend window, by product id.
+
+    The baseline is the lowest price on the earliest day in the window, read
+    from the daily buckets of the products' price stats (one batched read).
+    """
+    first_day = int(time.time() // DAY_SECONDS) - TREND_WINDOW_DAYS + 1
+    stats = get_price_stats([p["id"] for p in products])
+
+    trends = {}
+    for product in products:
+        product_stats = stats.get(product["id"])
+        if not product_stats:
+            continue
+        start = next(
+            (price for day, price in product_stats.window if day >= first_day),
+            None,
+        )
+        if start:
+            trends[product["id"]] = (start - product["current_price"]) / start
+    return trends
+
+
+def get_recommendations(
+    category: str, max_price: Optional[float] = None, limit: int = 5
+) -> list[dict]:
+    """
+    Get the best deals in a category.
+
+    The cached category slice is already ordered by discount, so the top
+    `limit * CANDIDATE_FACTOR` candidates under max_price are read off its
+    head and only those are re-ranked with their recent price trend.
+
+    Candidates are picked by discount alone on purpose: the trend needs
+    stats for every product it scores, so scoring the whole slice would cost
+    a read per category product. A product outside the candidates only
+    loses out if its trend beats theirs by more than the discount gap over
+    TREND_WEIGHT, and any drop large enough for that also raises its
+    discount, moving it up the slice.
+
+    Returns:
+        Products with added `discount` and `trend` fields, best deal first
+    """
+    wanted = limit * CANDIDATE_FACTOR
+    candidates = []
+    for product in _category_slice(category):
+        if max_price and product["current_price"] > max_price:
+            continue
+        candidates.append(product)
+        if len(candidates) == wanted:
+            break
+    if not candidates:
+        return []
+
+    try:
+        trends = _trends(candidates)
+    except Exception as e:
+        print(f"Price trend lookup failed: {e}")
+        trends = {}
+
+    def score(product: dict) -> float:
+        return discount(product) + TREND_WEIGHT * trends.get(product["id"], 0.0)
+
+    return [
+        {
+            **product,
+            "discount": round(discount(product), 4),
+            "trend": round(trends.get(product["id"], 0.0), 4),
+        }
+        for product in heapq.nlargest(limit, candidates, key=score)
+    ]
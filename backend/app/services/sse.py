@@ -0,0 +1,55 @@
+"""Server-Sent Events frame encoding for the chat stream."""
+
+from functools import lru_cache
+from typing import Iterator
+
+import orjson
+
+# Constant frames are encoded once at import time
+DONE_FRAME = b'data: {"type":"done"}\n\n'
+
+# Flush buffered text once it reaches this many bytes
+TEXT_BATCH_BYTES = 48
+
+
+def encode_event(payload: dict) -> bytes:
+    """Encode a payload as a single SSE data frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+@lru_cache(maxsize=64)
+def tool_frame(name: str) -> bytes:
+    """Get the pre-encoded frame announcing a tool call."""
+    return encode_event({"type": "tool", "name": name})
+
+
+def error_frame(message: str) -> bytes:
+    """Encode an error frame."""
+    return encode_event({"type": "error", "message": message})
+
+
+def text_frames(text: str, batch_bytes: int = TEXT_BATCH_BYTES) -> Iterator[bytes]:
+    """
+    Split text into word-aligned chunks and encode them as SSE text frames.
+
+    Words are batched until a chunk reaches `batch_bytes`, so a reply is
+    sent as a handful of frames instead of one frame per word. Joining
+    the chunk contents reproduces the words separated by single spaces.
+    """
+    words = text.split()
+    if not words:
+        return
+
+    buffer: list[str] = []
+    size = 0
+    last = len(words) - 1
+    for i, word in enumerate(words):
+        buffer.append(word if i == last else word + " ")
+        size += len(word) + 1
+        if size >= batch_bytes:
+            yield encode_event({"type": "text", "content": "".join(buffer)})
+            buffer.clear()
+            size = 0
+
+    if buffer:
+        yield encode_event({"type": "text", "content": "".join(buffer)})
@@ -0,0 +1,164 @@
+"""Bulk watchlist import from CSV or NDJSON."""
+
+import csv
+import io
+import math
+from typing import Optional
+from uuid import UUID
+
+import orjson
+
+from app.services.products import (
+    INSERT_CHUNK_SIZE,
+    create_tracked_items,
+    get_tracked_product_ids,
+    resolve_products,
+)
+
+
+def parse_watchlist(body: bytes, content_type: str = "") -> list[dict]:
+    """
+    Parse a watchlist upload into raw rows.
+
+    NDJSON is used when the content type says so or the body starts with
+    '{'; otherwise the body is read as CSV with a header row containing
+    `target_price` and either `query` or `product_id`. Lines that aren't
+    JSON objects become rows carrying an `_error`.
+
+    Raises:
+        ValueError: If the body isn't UTF-8 text
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Upload is not valid UTF-8: {e}")
+    stripped = text.lstrip()
+
+    if "ndjson" in content_type or "jsonl" in content_type or stripped.startswith("{"):
+        rows = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                row = {"_error": f"Invalid JSON: {e}"}
+            if not isinstance(row, dict):
+                row = {"_error": "Expected a JSON object"}
+            rows.append(row)
+        return rows
+
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+        for row in reader
+    ]
+
+
+def _validate(
+    row: dict,
+) -> tuple[Optional[str], Optional[str], Optional[float], Optional[str]]:
+    """Validate a raw row into (product_id, query, target_price, error)."""
+    if "_error" in row:
+        return None, None, None, row["_error"]
+
+    product_id = str(row.get("product_id") or "").strip() or None
+    query = str(row.get("query") or row.get("product_name") or "").strip() or None
+    if not product_id and not query:
+        return None, None, None, "Missing product_id or query"
+
+    if product_id:
+        try:
+            product_id = str(UUID(product_id))
+        except ValueError:
+            return None, None, None, "Invalid product_id"
+
+    try:
+        target_price = float(row.get("target_price"))
+    except (TypeError, ValueError):
+        return None, None, None, "Invalid target_price"
+    if not math.isfinite(target_price):
+        return None, None, None, "Invalid target_price"
+    if target_price <= 0:
+        return None, None, None, "target_price must be positive"
+
+    return product_id, query, target_price, None
+
+
+def import_watchlist(rows: list[dict]) -> dict:
+    """
+    Resolve and insert a batch of watchlist rows.
+
+    Products are resolved in one lookup per kind (ids, names), existing
+    tracked products and repeats within the upload are skipped, and new
+    items are written in chunked multi-row inserts.
+
+    Returns:
+        dict with per-row `results` and a `summary` of counts by status
+    """
+    results: list[dict] = []
+    valid: list[tuple[int, Optional[str], Optional[str], float]] = []
+
+    for index, row in enumerate(rows):
+        product_id, query, target_price, error = _validate(row)
+        if error:
+            results.append({"row": index, "status": "invalid", "error": error})
+        else:
+            results.append({"row": index, "status": "pending"})
+            valid.append((index, product_id, query, target_price))
+
+    by_id, by_query = resolve_products(
+        [pid for _, pid, _, _ in valid if pid],
+        [q for _, pid, q, _ in valid if not pid and q],
+    )
+    tracked = get_tracked_product_ids(
+        [p["id"] for p in (*by_id.values(), *by_query.values())]
+    )
+
+    to_insert: list[dict] = []
+    insert_rows: list[int] = []
+    for index, product_id, query, target_price in valid:
+        product = by_id.get(product_id) if product_id else by_query.get(query)
+        if not product:
+            results[index] = {
+                "row": index,
+                "status": "not_found",
+                "error": f"No product matching '{product_id or query}'",
+            }
+            continue
+
+        if product["id"] in tracked:
+            results[index] = {
+                "row": index,
+                "status": "duplicate",
+                "product_id": product["id"],
+                "product_name": product["name"],
+            }
+            continue
+
+        tracked.add(product["id"])
+        to_insert.append({"product_id": product["id"], "target_price": target_price})
+        insert_rows.append(index)
+        results[index] = {
+            "row": index,
+            "status": "created",
+            "product_id": product["id"],
+            "product_name": product["name"],
+            "target_price": target_price,
+        }
+
+    # Insert chunk by chunk so a failed chunk only fails its own rows
+    for start in range(0, len(to_insert), INSERT_CHUNK_SIZE):
+        try:
+            create_tracked_items(to_insert[start : start + INSERT_CHUNK_SIZE])
+        except Exception as e:
+            for index in insert_rows[start : start + INSERT_CHUNK_SIZE]:
+                results[index]["status"] = "failed"
+                results[index]["error"] = str(e)
+
+    summary: dict[str, int] = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+    return {"results": results, "summary": summary}
@@ -0,0 +1,170 @@
+"""Write-behind buffer for price_history/alerts appends and price_stats upserts."""
+
+import asyncio
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.repositories import get_repository
+from app.services import bus
+
+# Tables the buffer accepts -> the Repository method that writes their rows
+BUFFERED_TABLES = {
+    "price_history": "insert_price_history",
+    "alerts": "insert_alerts",
+    "price_stats": "upsert_price_stats",
+}
+
+# Failed flushes of a batch before it is retried row by row
+MAX_ATTEMPTS = 5
+
+
+class WriteBuffer:
+    """
+    Queue rows in memory and write them in multi-row inserts.
+
+    A background task flushes every `interval` seconds, or as soon as a
+    table has `max_rows` pending. Rows from a failed flush are put back
+    in front of the queue and retried on the next one; after MAX_ATTEMPTS
+    failures the batch is written row by row and rows that still fail are
+    dropped, so one bad row can't hold up the rest of its table. A table
+    with `max_pending` rows queued drops new rows until it drains. Dropped
+    rows are counted in `dropped`. Buffered rows are not visible to reads
+    until flushed.
+    """
+
+    def __init__(self, max_rows: int, interval: float, max_pending: int):
+        self.max_rows = max_rows
+        self.interval = interval
+        self.max_pending = max_pending
+        self.dropped: dict[str, int] = {t: 0 for t in BUFFERED_TABLES}
+        self._queues: dict[str, list[dict]] = {t: [] for t in BUFFERED_TABLES}
+        self._attempts: dict[str, int] = {t: 0 for t in BUFFERED_TABLES}
+        self._wake: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: list[Callable[[str, list[dict]], None]] = []
+
+    def add_flush_listener(self, listener: Callable[[str, list[dict]], None]) -> None:
+        """Call `listener(table, rows)` after rows are written."""
+        self._listeners.append(listener)
+
+    def append(self, table: str, row: dict) -> None:
+        """Queue a row for `table` (dropped if the table is at max_pending)."""
+        queue = self._queues[table]
+        if len(queue) >= self.max_pending:
+            self.dropped[table] += 1
+            if self.dropped[table] % 1000 == 1:
+                print(f"Write buffer full, dropped {self.dropped[table]} {table} rows")
+            return
+        queue.append(row)
+        if len(queue) >= self.max_rows and self._wake:
+            self._wake.set()
+
+    def depth(self) -> dict[str, int]:
+        """Pending rows per table."""
+        return {table: len(queue) for table, queue in self._queues.items()}
+
+    async def flush(self, table: Optional[str] = None) -> None:
+        """Write every pending row now (of one table, if given)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            repo = get_repository()
+            for name in [table] if table else list(self._queues):
+                queue = self._queues[name]
+                write = getattr(repo, BUFFERED_TABLES[name])
+                while queue:
+                    rows = queue[: self.max_rows]
+                    del queue[: self.max_rows]
+                    try:
+                        await asyncio.to_thread(write, rows)
+                        self._attempts[name] = 0
+                    except Exception as e:
+                        self._attempts[name] += 1
+                        print(f"Flushing {len(rows)} {name} rows failed: {e}")
+                        if self._attempts[name] < MAX_ATTEMPTS:
+                            queue[:0] = rows
+                            break
+                        self._attempts[name] = 0
+                        rows = await self._write_each(name, write, rows)
+                    if rows:
+                        self._notify(name, rows)
+
+    async def _write_each(self, table: str, write, rows: list[dict]) -> list[dict]:
+        """Write rows one at a time, dropping those that fail, and return the rest."""
+        written = []
+        for row in rows:
+            try:
+                await asyncio.to_thread(write, [row])
+                written.append(row)
+            except Exception as e:
+                self.dropped[table] += 1
+                print(f"Dropped {table} row {row}: {e}")
+        return written
+
+    def _notify(self, table: str, rows: list[dict]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(table, rows)
+            except Exception as e:
+                print(f"Write buffer listener failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every pending row (for when their tables are being emptied)."""
+        for queue in self._queues.values():
+            queue.clear()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # Keep the flusher alive; pending rows stay queued
+                print(f"Write buffer flush failed: {e}")
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+        lost = sum(self.depth().values())
+        if lost:
+            print(f"Write buffer stopped with {lost} unwritten rows: {self.depth()}")
+
+
+@lru_cache()
+def get_write_buffer() -> WriteBuffer:
+    """Get the process-wide write buffer."""
+    settings = get_settings()
+    return WriteBuffer(
+        settings.write_buffer_max_rows,
+        settings.write_buffer_interval,
+        settings.write_buffer_max_pending,
+    )
+
+
+def discard_pending_writes() -> None:
+    """Drop pending rows in every worker (call before the tables are cleared)."""
+    bus.publish("write_buffer", "clear")
+
+
+bus.subscribe("write_buffer", lambda _: get_write_buffer().clear())
@@ -0,0 +1,246 @@
+"""Benchmark script for JSON response and SSE frame serialization.
+
+Times the encoders in isolation and the full request paths that use them
+(through the ASGI app, with a local SQLite store and a stubbed LLM), and
+reports the encoders' share of per-request CPU before and after.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Local stand-ins so request paths don't touch the network
+os.environ.update(
+    STORAGE_BACKEND="sqlite",
+    SQLITE_PATH=os.path.join(tempfile.mkdtemp(), "bench.db"),
+)
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.main import app
+from app.responses import ORJSONResponse
+from app.repositories import get_repository
+from app.routers import chat as chat_router
+from app.routers import products as products_router
+from app.services.products import create_tracked_items
+
+from app.services.sse import DONE_FRAME, text_frames, tool_frame
+
+ITERATIONS = 2000
+
+# Full request paths are slower; fewer iterations keep the run short
+REQUEST_ITERATIONS = 300
+
+# Typical tool reply streamed back to the chat UI
+REPLY = (
+    "Great! I'm now tracking 'Samsung 65\" QLED 4K Smart TV' (currently $1099.99) "
+    "and will alert you when it drops below $900.00. "
+) * 3
+
+# Typical /api/products/tracked payload
+TRACKED = {
+    "tracked_items": [
+        {
+            "id": str(uuid.uuid4()),
+            "product_id": str(uuid.uuid4()),
+            "target_price": 900.0,
+            "created_at": "2026-01-15T12:00:00.000000+00:00",
+            "products": {
+                "id": str(uuid.uuid4()),
+                "name": f"Product {i}",
+                "category": "Electronics",
+                "current_price": 999.99 + i,
+                "original_price": 1199.99,
+                "image_url": None,
+            },
+        }
+        for i in range(50)
+    ]
+}
+
+
+def legacy_stream(text: str) -> list[str]:
+    """Frame generation as done before the SSE encoder existed."""
+    frames = [f"data: {json.dumps({'type': 'tool', 'name': 'track_product'})}\n\n"]
+    words = text.split()
+    for i, word in enumerate(words):
+        chunk = word + (" " if i < len(words) - 1 else "")
+        frames.append(f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n")
+    frames.append(f"data: {json.dumps({'type': 'done'})}\n\n")
+    return frames
+
+
+def current_stream(text: str) -> list[bytes]:
+    """Frame generation using the pre-encoded / batched SSE encoder."""
+    return [tool_frame("track_product"), *text_frames(text), DONE_FRAME]
+
+
+def legacy_json(payload: dict) -> bytes:
+    """Starlette's default JSONResponse rendering."""
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def current_json(payload: dict) -> bytes:
+    """ORJSONResponse rendering."""
+    return ORJSONResponse(payload).body
+
+
+async def stub_process_message(message: str, session_id: str, *args) -> dict:
+    """LLM stand-in that always asks for the track_product tool."""
+    return {
+        "content": "",
+        "tool_calls": [{"id": "call_1", "name": "track_product", "arguments": {}}],
+    }
+
+
+async def stub_tool_response(tool_name: str, tool_args: dict) -> str:
+    return REPLY
+
+
+async def legacy_generate_stream(message: str, session_id: str, request=None):
+    """The chat stream as it was before the SSE encoder (tool path only)."""
+    result = await stub_process_message(message, session_id)
+    for tool_call in result["tool_calls"]:
+        tool_result = await stub_tool_response(
+            tool_call["name"], tool_call["arguments"]
+        )
+        yield f"data: {json.dumps({'type': 'tool', 'name': tool_call['name']})}\n\n"
+        words = tool_result.split()
+        for i, word in enumerate(words):
+            chunk = word + (" " if i < len(words) - 1 else "")
+            yield f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n"
+    yield f"data: {json.dumps({'type': 'done'})}\n\n"
+
+
+def seed_tracked_items(count: int) -> None:
+    """Track `count` fresh products in the local store."""
+    products = get_repository().insert_products(
+        [
+            {
+                "name": f"Product {i}",
+                "category": "Electronics",
+                "current_price": 999.99 + i,
+                "original_price": 1199.99,
+            }
+            for i in range(count)
+        ]
+    )
+    create_tracked_items(
+        [{"product_id": p["id"], "target_price": 900.0} for p in products]
+    )
+
+
+def time_call(fn, arg) -> float:
+    """Time `fn(arg)` and return microseconds per call."""
+    fn(arg)
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn(arg)
+    return (time.process_time() - start) / ITERATIONS * 1e6
+
+
+def bench(label: str, fn, arg) -> float:
+    """Time and print `fn(arg)`, returning microseconds per call."""
+    per_call = time_call(fn, arg)
+    print(f"{label:<28} {per_call:10.1f} us/request")
+    return per_call
+
+
+def report_share(label: str, encode_us: float, request_us: float) -> None:
+    print(f"{label:<28} {encode_us / request_us:10.1%} of request CPU")
+
+
+async def bench_request(
+    label: str, client: httpx.AsyncClient, method: str, url: str, **kwargs
+) -> float:
+    """Time full in-process requests and return microseconds per request."""
+    await client.request(method, url, **kwargs)
+    start = time.process_time()
+    for _ in range(REQUEST_ITERATIONS):
+        (await client.request(method, url, **kwargs)).content
+    per_call = (time.process_time() - start) / REQUEST_ITERATIONS * 1e6
+    print(f"{label:<28} {per_call:10.1f} us/request")
+    return per_call
+
+
+def asgi_client(asgi_app) -> httpx.AsyncClient:
+    """Client calling the app in-process (no sockets, no threads)."""
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=asgi_app), base_url="http://bench"
+    )
+
+
+async def bench_requests():
+    """Time the request paths before and after, with the encoders' share."""
+    print("\n=== Request path: POST /api/chat (stubbed LLM) ===")
+    chat_router.process_message = stub_process_message
+    chat_router.get_tool_response = stub_tool_response
+    body = {"message": "Track the TV under $900", "session_id": "bench"}
+
+    async with asgi_client(app) as client:
+        current_generate = chat_router.generate_stream
+        chat_router.generate_stream = legacy_generate_stream
+        before = await bench_request(
+            "before: request", client, "POST", "/api/chat", json=body
+        )
+        chat_router.generate_stream = current_generate
+        after = await bench_request(
+            "after: request", client, "POST", "/api/chat", json=body
+        )
+    report_share("before: SSE encoding", time_call(legacy_stream, REPLY), before)
+    report_share("after: SSE encoding", time_call(current_stream, REPLY), after)
+
+    count = len(TRACKED["tracked_items"])
+    print(f"\n=== Request path: GET /api/products/tracked ({count} items) ===")
+    seed_tracked_items(count)
+    # The pre-orjson app: same router, Starlette's default JSONResponse
+    legacy_app = FastAPI(default_response_class=JSONResponse)
+    legacy_app.include_router(products_router.router)
+
+    async with asgi_client(legacy_app) as client:
+        payload = (await client.get("/api/products/tracked")).json()
+        before = await bench_request(
+            "before: request", client, "GET", "/api/products/tracked"
+        )
+    async with asgi_client(app) as client:
+        after = await bench_request(
+            "after: request", client, "GET", "/api/products/tracked"
+        )
+    report_share("before: JSON encoding", time_call(legacy_json, payload), before)
+    report_share("after: JSON encoding", time_call(current_json, payload), after)
+
+
+def main():
+    """Run all benchmarks."""
+    print("=" * 60)
+    print("Serialization Benchmarks")
+    print("=" * 60)
+
+    print(f"\n=== SSE chat reply ({len(REPLY.split())} words) ===")
+    before = bench("json.dumps per word", legacy_stream, REPLY)
+    after = bench("batched orjson frames", current_stream, REPLY)
+    print(f"frames: {len(legacy_stream(REPLY))} -> {len(current_stream(REPLY))}")
+    print(f"speedup: {before / after:.1f}x")
+
+    print(f"\n=== Tracked items response ({len(TRACKED['tracked_items'])} items) ===")
+    before = bench("JSONResponse (json)", legacy_json, TRACKED)
+    after = bench("ORJSONResponse (orjson)", current_json, TRACKED)
+    print(f"speedup: {before / after:.1f}x")
+
+    asyncio.run(bench_requests())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Seeded market simulation for load testing the alert pipeline.
+
+Drives random-walk price series for N products through the same
+price-update and alert paths as /api/alerts/simulate, against a local
+SQLite database and the "log" email stand-in, and reports end-to-end
+latency from price change to email handoff and to the alert row write.
+
+Usage:
+    python simulate_market.py --products 200 --rate 500 --duration 30 --seed 42
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=200.0, help="price ticks/sec")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--volatility", type=float, default=0.02, help="per tick")
+    parser.add_argument("--db", default=None, help="SQLite file (default: temp)")
+    return parser.parse_args()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples: list[float]) -> None:
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<24} n={len(ms):<7} p50={percentile(ms, 50):8.2f}ms "
+        f"p95={percentile(ms, 95):8.2f}ms p99={percentile(ms, 99):8.2f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Imported after the environment points the app at local stand-ins
+    from app.repositories import get_repository
+    from app.services.alerts import apply_price_change, trigger_alert
+    from app.services.products import create_tracked_items, get_tracked_items
+    from app.services.write_buffer import get_write_buffer
+
+    rng = random.Random(args.seed)
+    repo = get_repository()
+    buffer = get_write_buffer()
+
+    # Seed the catalog and track every product 10% below its start price
+    products = repo.insert_products(
+        [
+            {
+                "name": f"Sim Product {i}",
+                "category": "Simulation",
+                "current_price": (price := round(rng.uniform(50, 2000), 2)),
+                "original_price": price,
+            }
+            for i in range(args.products)
+        ]
+    )
+    create_tracked_items(
+        [
+            {"product_id": p["id"], "target_price": round(p["current_price"] * 0.9, 2)}
+            for p in products
+        ]
+    )
+    items_by_product: dict[str, list[dict]] = {}
+    for item in get_tracked_items():
+        items_by_product.setdefault(item["product_id"], []).append(item)
+    prices = {p["id"]: p["current_price"] for p in products}
+    product_ids = list(prices)
+
+    # Latency from price change to the alert row being written
+    pending: dict[tuple[str, float], float] = {}
+    alert_row: list[float] = []
+
+    def on_flush(table: str, rows: list[dict]) -> None:
+        if table != "alerts":
+            return
+        now = time.perf_counter()
+        for row in rows:
+            started = pending.pop((row["tracked_item_id"], row["new_price"]), None)
+            if started is not None:
+                alert_row.append(now - started)
+
+    buffer.add_flush_listener(on_flush)
+    buffer.start()
+
+    price_update: list[float] = []
+    email_handoff: list[float] = []
+    ticks = 0
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    deadline = start + args.duration
+
+    while time.perf_counter() < deadline:
+        product_id = rng.choice(product_ids)
+        old_price = prices[product_id]
+        new_price = round(old_price * math.exp(rng.gauss(0, args.volatility)), 2)
+        prices[product_id] = new_price
+
+        started = time.perf_counter()
+        apply_price_change(product_id, new_price, old_price=old_price)
+        price_update.append(time.perf_counter() - started)
+
+        # Alert on crossings below target, like a real price feed would
+        for item in items_by_product.get(product_id, []):
+            if new_price < item["target_price"] <= old_price:
+                pending[(item["id"], new_price)] = started
+                await trigger_alert(item, old_price, new_price, "sim@example.com")
+                email_handoff.append(time.perf_counter() - started)
+
+        ticks += 1
+        # Pace to the requested rate, catching up if we fall behind
+        delay = start + ticks * interval - time.perf_counter()
+        await asyncio.sleep(max(delay, 0))
+
+    elapsed = time.perf_counter() - start
+    await buffer.stop()
+
+    print("=" * 60)
+    print("Market Simulation")
+    print("=" * 60)
+    print(f"seed={args.seed} products={args.products} target rate={args.rate}/s")
+    print(
+        f"ticks={ticks} achieved rate={ticks / elapsed:.1f}/s "
+        f"alerts={len(email_handoff)}"
+    )
+    report("price update", price_update)
+    report("email handoff", email_handoff)
+    report("alert row written", alert_row)
+
+
+def main():
+    args = parse_args()
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "market-sim.db")
+    os.environ.update(
+        STORAGE_BACKEND="sqlite",
+        SQLITE_PATH=db_path,
+        EMAIL_BACKEND="log",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Shared fixtures: every test gets a fresh local SQLite store."""
+
+import pytest
+
+from app.config import get_settings
+from app.repositories import get_repository
+from app.services import dashboard, price_stats, recommendations
+from app.services.write_buffer import get_write_buffer
+
+
+@pytest.fixture(autouse=True)
+def repo(tmp_path, monkeypatch):
+    """Point the app at an empty SQLite database and reset in-process caches."""
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "test.db"))
+    get_settings.cache_clear()
+    get_repository.cache_clear()
+
+    dashboard._snapshots = None
+    dashboard._last_seen.clear()
+    price_stats._stats_cache.clear()
+    recommendations._category_cache.clear()
+    get_write_buffer().clear()
+
+    yield get_repository()
+
+    get_settings.cache_clear()
+    get_repository.cache_clear()
+
+
+@pytest.fixture
+def products(repo):
+    """The seeded demo catalog."""
+    return repo.list_products()
@@ -0,0 +1,69 @@
+"""Cross-worker bus."""
+
+import asyncio
+import os
+import socket
+
+import pytest
+
+from app.config import get_settings
+from app.services import bus
+
+
+@pytest.fixture
+def bus_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("BUS_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    return tmp_path / str(os.getppid())
+
+
+def run_bus(check):
+    async def main():
+        bus.start()
+        try:
+            await check()
+        finally:
+            bus.stop()
+
+    asyncio.run(main())
+
+
+def test_single_process_is_owner():
+    assert bus.is_owner()
+
+
+def test_delivers_messages_from_other_workers(bus_dir, monkeypatch):
+    received = []
+    monkeypatch.setitem(bus._handlers, "test_topic", [received.append])
+
+    async def check():
+        peer = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        target = str(bus_dir / f"{os.getpid()}.sock")
+        # Foreign datagrams on the socket are ignored
+        peer.sendto(b"not json", target)
+        peer.sendto(b"[1, 2]", target)
+        peer.sendto(b'{"topic": "test_topic", "payload": {"n": 1}}', target)
+        peer.close()
+        await asyncio.sleep(0.05)
+
+    run_bus(check)
+    assert received == [{"n": 1}]
+
+
+def test_owner_decision_is_cached_until_a_send_fails(bus_dir):
+    async def check():
+        assert bus.is_owner()
+
+        # A live worker with a lower pid joins (pid 1 always exists)
+        (bus_dir / "1.sock").touch()
+        assert bus.is_owner()
+
+        bus._owner = (bus._owner[0] - bus.OWNER_CHECK_INTERVAL, True)
+        assert not bus.is_owner()
+
+        # Sending to it fails, so it is pruned and ownership rechecked
+        bus.publish("test_topic")
+        assert not (bus_dir / "1.sock").exists()
+        assert bus.is_owner()
+
+    run_bus(check)
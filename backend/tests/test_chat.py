@@ -0,0 +1,67 @@
+"""Chat streaming and disconnect cancellation."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app.routers import chat
+from app.services.llm import MAX_TOKENS
+
+
+class FakeRequest:
+    """Reports a disconnect after `connected_for` checks."""
+
+    def __init__(self, connected_for: int):
+        self.checks = 0
+        self.connected_for = connected_for
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.checks > self.connected_for
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = dict.fromkeys(chat.stream_stats, 0)
+    monkeypatch.setattr(chat, "stream_stats", stats)
+    monkeypatch.setattr(chat, "DISCONNECT_POLL_INTERVAL", 0.01)
+    return stats
+
+
+async def collect(request: FakeRequest) -> list[dict]:
+    return [
+        orjson.loads(frame[len(b"data: ") : -2])
+        async for frame in chat.generate_stream("hi", "session", request)
+    ]
+
+
+def test_disconnect_cancels_the_llm_call(stats, monkeypatch):
+    cancelled = []
+
+    async def slow_llm(message, session_id):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(chat, "process_message", slow_llm)
+
+    assert asyncio.run(collect(FakeRequest(connected_for=1))) == []
+    assert cancelled == [True]
+    assert stats["cancelled_streams"] == 1
+    assert stats["cancelled_llm_calls"] == 1
+    assert stats["saved_tokens_estimate"] == MAX_TOKENS
+
+
+def test_connected_stream_completes(stats, monkeypatch):
+    async def llm(message, session_id):
+        return {"content": "Hello there"}
+
+    monkeypatch.setattr(chat, "process_message", llm)
+
+    frames = asyncio.run(collect(FakeRequest(connected_for=1000)))
+    assert frames[-1] == {"type": "done"}
+    assert "".join(f["content"] for f in frames[:-1]) == "Hello there"
+    assert stats == {**dict.fromkeys(stats, 0), "streams": 1}
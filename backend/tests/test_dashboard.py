@@ -0,0 +1,73 @@
+"""Incrementally maintained dashboard snapshot."""
+
+from app.services import dashboard
+from app.services.products import create_tracked_items, get_tracked_items
+
+
+def event(op: str, seq: int, origin: int = 1, **fields) -> dict:
+    return {"op": op, "origin": origin, "seq": seq, **fields}
+
+
+def track_all(products: list[dict], target_price: float = 100.0) -> list[dict]:
+    create_tracked_items(
+        [{"product_id": p["id"], "target_price": target_price} for p in products]
+    )
+    return get_tracked_items()
+
+
+def test_tracked_event_reads_rows_back(repo, products):
+    assert get_tracked_items() == []
+
+    items = track_all(products)
+    assert len(items) == 3
+    assert all(item["latest_alert"] is None for item in items)
+    assert {item["delta_to_target"] for item in items} == {
+        round(p["current_price"] - 100.0, 2) for p in products
+    }
+
+
+def test_price_and_alert_events_patch_entries(products):
+    items = track_all(products)
+    item = items[0]
+
+    dashboard._apply(event("price", 1, product_id=item["product_id"], price=80.0))
+    dashboard._apply(
+        event("alert", 2, tracked_item_id=item["id"], alert={"new_price": 80.0})
+    )
+
+    patched = {i["id"]: i for i in get_tracked_items()}[item["id"]]
+    assert patched["products"]["current_price"] == 80.0
+    assert patched["delta_to_target"] == -20.0
+    assert patched["latest_alert"] == {"new_price": 80.0}
+
+
+def test_sequence_gap_drops_snapshot(products):
+    track_all(products)
+    dashboard._apply(event("price", 1, product_id="x", price=1.0))
+    assert dashboard._snapshots is not None
+
+    # seq 2 from this worker was lost
+    dashboard._apply(event("price", 3, product_id="x", price=1.0))
+    assert dashboard._snapshots is None
+    assert len(get_tracked_items()) == 3
+
+
+def test_reset_drops_snapshot(products):
+    track_all(products)
+    dashboard.reset_dashboard()
+    assert dashboard._snapshots is None
+
+
+def test_unreadable_tracked_rows_drop_snapshot(repo, products, monkeypatch):
+    track_all(products[:1])
+
+    def unavailable(item_ids=None):
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(repo, "list_tracked_items", unavailable)
+        dashboard._apply(event("tracked", 1, ids=["new-item"]))
+    assert dashboard._snapshots is None
+
+    # Rebuilt from the repository on the next read
+    assert len(track_all(products[1:])) == 3
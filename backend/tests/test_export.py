@@ -0,0 +1,69 @@
+"""Streaming table export encoders."""
+
+import csv
+import gzip
+import io
+import zlib
+from functools import partial
+
+import orjson
+import pytest
+
+from app.services import export
+from app.services.export import export_stream, gzip_chunks
+
+
+@pytest.fixture
+def history(repo, products, monkeypatch):
+    # Several pages, so chunk boundaries are exercised
+    monkeypatch.setattr(export, "iter_pages", partial(export.iter_pages, page_size=4))
+    repo.insert_price_history(
+        [
+            {
+                "product_id": products[i % 3]["id"],
+                "price": 100.0 + i,
+                "created_at": f"2026-01-01T00:00:{i:02d}+00:00",
+            }
+            for i in range(10)
+        ]
+    )
+    return repo.page_rows("price_history", None, 100)
+
+
+def test_csv_export(history):
+    text = b"".join(export_stream("price_history", "csv")).decode()
+    rows = list(csv.DictReader(io.StringIO(text)))
+
+    assert list(rows[0]) == export.EXPORT_COLUMNS["price_history"]
+    assert [row["id"] for row in rows] == [row["id"] for row in history]
+    assert [float(row["price"]) for row in rows] == [row["price"] for row in history]
+
+
+def test_ndjson_export(history):
+    chunks = list(export_stream("price_history", "ndjson"))
+    rows = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+
+    # One chunk per keyset page
+    assert len(chunks) == 3
+    assert [row["id"] for row in rows] == [row["id"] for row in history]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_gzip_export_round_trips(history, fmt):
+    plain = b"".join(export_stream("price_history", fmt))
+    assert gzip.decompress(b"".join(export_stream("price_history", fmt, True))) == plain
+
+
+def test_gzip_chunks_are_decodable_as_they_arrive():
+    decompressor = zlib.decompressobj(31)
+    chunks = gzip_chunks([b"first page\n", b"second page\n"])
+
+    assert decompressor.decompress(next(chunks)) == b"first page\n"
+    assert decompressor.decompress(next(chunks)) == b"second page\n"
+
+
+def test_empty_table_exports_header_only(repo):
+    assert b"".join(export_stream("alerts", "csv")).decode().strip() == ",".join(
+        export.EXPORT_COLUMNS["alerts"]
+    )
+    assert list(export_stream("alerts", "ndjson")) == []
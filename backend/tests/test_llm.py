@@ -0,0 +1,55 @@
+"""Tool results handed back to the model."""
+
+import asyncio
+
+import pytest
+
+from app.services.llm import (
+    MAX_LISTED_ITEMS,
+    TOOL_RESULT_BUDGET,
+    compact_tool_result,
+    get_tool_response,
+)
+
+
+def test_compact_collapses_whitespace():
+    assert compact_tool_result("  a   b \n\n\t c  \n") == "a b\nc"
+
+
+@pytest.mark.parametrize("budget", [40, 60, 100])
+def test_compact_cuts_at_lines_within_budget(budget):
+    text = "\n".join(f"line number {i}" for i in range(20))
+    result = compact_tool_result(text, budget)
+
+    assert len(result) <= budget
+    kept, note = result.rsplit("\n", 1)
+    assert text.startswith(kept)
+    assert note == f"(+{20 - len(kept.splitlines())} more lines truncated)"
+
+
+def test_compact_shortens_an_oversized_first_line():
+    result = compact_tool_result("x" * 100 + "\nsecond", 60)
+    assert len(result) <= 60
+    assert result.startswith("xxx") and "…\n(+1 more lines truncated)" in result
+
+
+def test_tool_responses_fit_the_budget(repo, products):
+    rows = repo.insert_products(
+        [
+            {
+                "name": f"Extremely Long Product Name Number {i} With Many Words",
+                "category": "Tablet",
+                "current_price": 100.0 + i,
+            }
+            for i in range(30)
+        ]
+    )
+    repo.insert_tracked_items(
+        [{"product_id": row["id"], "target_price": 50.0} for row in rows]
+    )
+
+    result = asyncio.run(get_tool_response("list_tracked_items", {}))
+    assert len(result) <= TOOL_RESULT_BUDGET
+    # The list itself is already capped, so it arrives whole
+    assert result.count("\n- ") == MAX_LISTED_ITEMS
+    assert result.endswith("...and 20 more.")
@@ -0,0 +1,87 @@
+"""Deadlines, retries and hedging around OpenAI requests."""
+
+import asyncio
+from collections import deque
+
+import httpx
+import openai
+import pytest
+
+from app.services import openai_client
+from app.services.openai_client import create_completion
+
+
+class FakeCompletions:
+    """Answers each call after the delay (or with the error) scripted for it."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        outcome = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        return f"response {self.calls}"
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    def install(*script):
+        fake = FakeCompletions(*script)
+        client = type("Client", (), {})()
+        client.chat = type("Chat", (), {"completions": fake})()
+        monkeypatch.setattr(openai_client, "get_openai_client", lambda: client)
+        return fake
+
+    monkeypatch.setattr(openai_client, "_latencies", deque(maxlen=10))
+    monkeypatch.setattr(openai_client, "MIN_HEDGE_SAMPLES", 3)
+    monkeypatch.setattr(openai_client, "MIN_HEDGE_DELAY", 0.01)
+    monkeypatch.setattr(openai_client.random, "uniform", lambda low, high: 0)
+    return install
+
+
+def connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "http://test"))
+
+
+def test_retries_retryable_errors(completions):
+    fake = completions(connection_error(), 0)
+    assert asyncio.run(create_completion()) == "response 2"
+    assert fake.calls == 2
+    assert len(openai_client._latencies) == 1
+
+
+def test_gives_up_after_max_retries(completions):
+    fake = completions(connection_error())
+    with pytest.raises(openai.APIConnectionError):
+        asyncio.run(create_completion())
+    assert fake.calls == 3
+    assert not openai_client._latencies
+
+
+def test_hedges_past_the_p95(completions):
+    fake = completions(1.0, 0)
+    openai_client._latencies.extend([0.01] * 3)
+
+    assert asyncio.run(create_completion()) == "response 2"
+    assert fake.calls == 2
+    # The losing first request is kept at its elapsed time
+    assert len(openai_client._latencies) == 4
+    assert 0.01 <= openai_client._latencies[-1] < 1.0
+
+
+def test_external_cancel_is_not_recorded(completions):
+    completions(1.0)
+
+    async def disconnect():
+        task = asyncio.ensure_future(create_completion())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(disconnect())
+    assert not openai_client._latencies
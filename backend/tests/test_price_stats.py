@@ -0,0 +1,126 @@
+"""Rolling price statistics."""
+
+import asyncio
+
+import pytest
+
+from app.services.price_stats import (
+    EWMA_ALPHA,
+    ROLLING_WINDOW_DAYS,
+    PriceStats,
+    assess_prices,
+    get_price_stats,
+    record_price,
+)
+from app.services.write_buffer import get_write_buffer
+
+DAY = 86400
+
+
+def test_update_tracks_ewma_and_variance():
+    stats = PriceStats()
+    stats.update(100.0, at=0)
+    assert (stats.count, stats.mean, stats.var) == (1, 100.0, 0.0)
+
+    stats.update(90.0, at=1)
+    assert stats.mean == pytest.approx(100.0 - EWMA_ALPHA * 10)
+    assert stats.var == pytest.approx((1 - EWMA_ALPHA) * (10 * EWMA_ALPHA * 10))
+
+
+def test_rolling_min_and_all_time_low():
+    stats = PriceStats()
+    stats.update(80.0, at=0)
+    stats.update(100.0, at=DAY)
+    stats.update(95.0, at=DAY + 60)
+    stats.update(90.0, at=2 * DAY)
+    assert stats.rolling_min == 80.0
+    # One bucket per day holding that day's lowest price
+    assert stats.window == [[0, 80.0], [1, 95.0], [2, 90.0]]
+
+    # Once the 80 leaves the window, the next-lowest day takes over
+    stats.update(95.0, at=ROLLING_WINDOW_DAYS * DAY)
+    assert stats.rolling_min == 90.0
+    assert stats.all_time_low == 80.0
+
+
+def test_rolling_window_expires_old_points():
+    stats = PriceStats()
+    stats.update(50.0, at=0)
+    stats.update(70.0, at=(ROLLING_WINDOW_DAYS + 1) * DAY)
+    assert stats.rolling_min == 70.0
+    assert stats.all_time_low == 50.0
+
+
+def test_window_is_bounded_by_days():
+    stats = PriceStats()
+    for i in range(20000):
+        stats.update(100.0 + i % 7, at=i * 600)
+    assert len(stats.window) == ROLLING_WINDOW_DAYS
+
+
+def test_reads_timestamped_windows():
+    start = 20000 * DAY
+    stats = PriceStats.from_dict(
+        {
+            "count": 3,
+            "mean": 90.0,
+            "var": 1.0,
+            "all_time_low": 80.0,
+            "window": [
+                [start + 100.0, 80.0],
+                [start + DAY + 5.0, 85.0],
+                [start + DAY + 50.0, 90.0],
+            ],
+        }
+    )
+    assert stats.window == [[20000, 80.0], [20001, 85.0]]
+
+
+def test_assess():
+    stats = PriceStats()
+    for i, price in enumerate([100, 102, 98, 101, 99, 100]):
+        stats.update(price, at=i)
+
+    assert stats.assess(100)["real_deal"] is False
+    deal = stats.assess(90)
+    assert deal["all_time_low"] is True
+    assert deal["zscore"] < 0
+    assert deal["real_deal"] is True
+    assert PriceStats().assess(10)["zscore"] == 0.0
+
+
+def test_round_trips_through_dict():
+    stats = PriceStats()
+    for i, price in enumerate([10.0, 12.0, 9.0]):
+        stats.update(price, at=i)
+
+    restored = PriceStats.from_dict(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict()
+    assert restored.rolling_min == stats.rolling_min
+
+
+def test_record_price_persists_through_the_buffer(repo, products):
+    product_id = products[0]["id"]
+
+    first = record_price(product_id, 90.0, previous_price=100.0)
+    record_price(product_id, 80.0, previous_price=90.0)
+    # Judged against the price it dropped from
+    assert first["all_time_low"] is True
+    assert repo.get_price_stats([product_id]) == {}
+
+    asyncio.run(get_write_buffer().flush())
+    assert repo.get_price_stats([product_id])[product_id]["count"] == 3
+    assert get_price_stats([product_id])[product_id].all_time_low == 80.0
+
+
+def test_missing_stats_table_does_not_block_price_changes(repo, products, monkeypatch):
+    def missing_table(product_ids):
+        raise RuntimeError('relation "price_stats" does not exist')
+
+    monkeypatch.setattr(repo, "get_price_stats", missing_table)
+    product_id = products[0]["id"]
+
+    assert record_price(product_id, 90.0, previous_price=100.0)["real_deal"] is False
+    assert assess_prices({product_id: 90.0}) == {}
+    # The owner skips the fold rather than overwrite the stored stats
+    assert get_write_buffer().depth().get("price_stats", 0) == 0
@@ -0,0 +1,64 @@
+"""On-demand sampling profiler."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.profiler import (
+    ProfilerMiddleware,
+    ProfileSession,
+    end_session,
+    profiler_available,
+    start_session,
+)
+
+pytestmark = pytest.mark.skipif(
+    not profiler_available(), reason="needs POSIX interval timers"
+)
+
+
+async def busy_app(scope, receive, send):
+    deadline = time.process_time() + 0.2
+    while time.process_time() < deadline:
+        pass
+
+
+def request(path: str) -> None:
+    scope = {"type": "http", "method": "GET", "path": path}
+    asyncio.run(ProfilerMiddleware(busy_app)(scope, None, None))
+
+
+def test_samples_are_attributed_to_routes():
+    session = ProfileSession(duration=5, interval=0.005)
+    assert start_session(session)
+    try:
+        assert not start_session(ProfileSession(duration=5, interval=0.005))
+        request("/api/busy")
+    finally:
+        end_session(session)
+
+    assert session.samples > 0
+    assert session.routes["GET /api/busy"] > 0
+    assert any(
+        line.startswith("GET /api/busy;") and "busy_app" in line
+        for line in session.collapsed().splitlines()
+    )
+
+
+def test_route_filter_and_request_limit():
+    session = ProfileSession(
+        duration=5, interval=0.005, route="/api/busy", max_requests=2
+    )
+    start_session(session)
+    try:
+        request("/api/other")
+        request("/api/busy")
+        assert not session.done.is_set()
+        request("/api/busy")
+        assert session.done.is_set()
+    finally:
+        end_session(session)
+
+    assert session.summary()["requests"] == 2
+    assert set(session.routes) == {"GET /api/busy"}
@@ -0,0 +1,57 @@
+"""Deal ranking over cached category slices."""
+
+import time
+
+from app.services import price_stats
+from app.services.price_stats import DAY_SECONDS, PriceStats
+from app.services.recommendations import (
+    get_recommendations,
+    update_category_price,
+)
+
+
+def _tablets(repo, prices):
+    return repo.insert_products(
+        [
+            {
+                "name": f"Tablet {i}",
+                "category": "Tablet",
+                "current_price": current,
+                "original_price": original,
+            }
+            for i, (current, original) in enumerate(prices)
+        ]
+    )
+
+
+def test_ranks_by_discount(repo):
+    _tablets(repo, [(90.0, 100.0), (50.0, 100.0), (100.0, 100.0), (70.0, 100.0)])
+
+    deals = get_recommendations("tablet", limit=3)
+    assert [d["discount"] for d in deals] == [0.5, 0.3, 0.1]
+    assert [d["name"] for d in get_recommendations("tablet", max_price=80)] == [
+        "Tablet 1",
+        "Tablet 3",
+    ]
+
+
+def test_trend_breaks_close_discounts(repo):
+    steady, falling = _tablets(repo, [(80.0, 100.0), (81.0, 100.0)])
+    stats = PriceStats()
+    stats.update(100.0, at=time.time() - 5 * DAY_SECONDS)
+    price_stats._stats_cache[falling["id"]] = stats
+
+    deals = get_recommendations("tablet")
+    assert [d["id"] for d in deals] == [falling["id"], steady["id"]]
+    assert deals[0]["trend"] == 0.19
+
+
+def test_patched_price_reorders_cached_slice(repo):
+    tablets = _tablets(repo, [(90.0, 100.0), (80.0, 100.0)])
+    assert get_recommendations("tablet")[0]["id"] == tablets[1]["id"]
+
+    # Patched into the cached slice, which is not reread from the repository
+    update_category_price(tablets[0]["id"], 10.0)
+    deals = get_recommendations("tablet")
+    assert [d["id"] for d in deals] == [tablets[0]["id"], tablets[1]["id"]]
+    assert deals[0]["current_price"] == 10.0
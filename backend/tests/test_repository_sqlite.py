@@ -0,0 +1,63 @@
+"""SQLite repository queries."""
+
+from app.repositories.sqlite import SQLiteRepository
+
+
+def test_seeds_demo_catalog_once(tmp_path):
+    path = str(tmp_path / "seed.db")
+    SQLiteRepository(path)
+    assert len(SQLiteRepository(path).list_products()) == 3
+
+
+def test_page_rows_keyset_continuity(repo, products):
+    # Shared timestamps force the id tie-breaker across page boundaries
+    rows = [
+        {
+            "product_id": products[0]["id"],
+            "price": float(i),
+            "created_at": f"2026-01-01T00:00:0{i % 3}+00:00",
+        }
+        for i in range(25)
+    ]
+    repo.insert_price_history(rows)
+
+    seen, after = [], None
+    while True:
+        page = repo.page_rows("price_history", after, 4)
+        seen.extend(page)
+        if len(page) < 4:
+            break
+        after = (page[-1]["created_at"], page[-1]["id"])
+
+    keys = [(row["created_at"], row["id"]) for row in seen]
+    assert len(seen) == 25
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 25
+
+
+def test_tracked_items_embed_latest_alert(repo, products):
+    item = repo.insert_tracked_items(
+        [{"product_id": products[0]["id"], "target_price": 100}]
+    )[0]
+    assert repo.list_tracked_items()[0]["latest_alert"] is None
+
+    repo.insert_alerts(
+        [
+            {
+                "tracked_item_id": item["id"],
+                "old_price": 120,
+                "new_price": new_price,
+                "email_sent": True,
+                "created_at": created_at,
+            }
+            for new_price, created_at in [
+                (90, "2026-01-02T00:00:00"),
+                (95, "2026-01-01T00:00:00"),
+            ]
+        ]
+    )
+    [tracked] = repo.list_tracked_items([item["id"]])
+    assert tracked["products"]["id"] == products[0]["id"]
+    assert tracked["latest_alert"]["new_price"] == 90
+    assert tracked["latest_alert"]["email_sent"] is True
+    assert repo.list_tracked_items([]) == []
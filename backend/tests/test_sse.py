@@ -0,0 +1,49 @@
+"""SSE frame encoding."""
+
+import orjson
+
+from app.services.sse import DONE_FRAME, error_frame, text_frames, tool_frame
+
+
+def decode(frame: bytes) -> dict:
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    return orjson.loads(frame[len(b"data: ") : -2])
+
+
+def test_text_frames_round_trip():
+    text = "Great!  I'm now tracking 'Samsung 65\" TV' — alert below $900.00.\n" * 5
+    frames = list(text_frames(text))
+
+    chunks = [decode(frame) for frame in frames]
+    assert all(chunk["type"] == "text" for chunk in chunks)
+    assert "".join(chunk["content"] for chunk in chunks) == " ".join(text.split())
+
+
+def test_text_frames_batches_words():
+    text = " ".join(f"word{i}" for i in range(100))
+    frames = list(text_frames(text, batch_bytes=48))
+
+    assert len(frames) < 100
+    assert all(len(decode(f)["content"]) >= 48 for f in frames[:-1])
+
+
+def test_text_frames_empty():
+    assert list(text_frames("")) == []
+    assert list(text_frames("   \n ")) == []
+
+
+def test_constant_frames():
+    assert decode(DONE_FRAME) == {"type": "done"}
+    assert decode(tool_frame("track_product")) == {
+        "type": "tool",
+        "name": "track_product",
+    }
+    assert decode(error_frame("boom")) == {"type": "error", "message": "boom"}
+
+
+def test_orjson_response_renders_json():
+    from app.responses import ORJSONResponse
+
+    response = ORJSONResponse({"price": 9.99, 1: "non-str key"})
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == {"price": 9.99, "1": "non-str key"}
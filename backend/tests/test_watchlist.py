@@ -0,0 +1,89 @@
+"""Bulk watchlist parsing and import."""
+
+import pytest
+
+from app.services.watchlist import import_watchlist, parse_watchlist
+
+
+def test_parse_csv():
+    body = b"\xef\xbb\xbfQuery,Target_Price\nSony headphones, 300\n"
+    assert parse_watchlist(body, "text/csv") == [
+        {"query": "Sony headphones", "target_price": "300"}
+    ]
+
+
+def test_parse_ndjson_marks_bad_lines():
+    body = b'{"query": "tv", "target_price": 900}\n\n1\n[1, 2]\n{oops\n'
+    rows = parse_watchlist(body, "application/x-ndjson")
+
+    assert rows[0] == {"query": "tv", "target_price": 900}
+    assert rows[1] == rows[2] == {"_error": "Expected a JSON object"}
+    assert rows[3]["_error"].startswith("Invalid JSON")
+
+
+def test_parse_rejects_non_utf8():
+    with pytest.raises(ValueError):
+        parse_watchlist(b"\xff\xfe{", "")
+
+
+def test_import_statuses(repo, products):
+    by_name = {p["name"]: p for p in products}
+    tv = by_name['Samsung 65" QLED 4K Smart TV']
+    repo.insert_tracked_items([{"product_id": tv["id"], "target_price": 900}])
+
+    rows = [
+        {"query": "Sony WH-1000XM5", "target_price": 300},
+        {"query": "sony headphones", "target_price": 250},  # same product again
+        {"product_id": tv["id"], "target_price": 800},  # already tracked
+        {"query": "Nintendo Switch", "target_price": 200},
+        {"product_id": "not-a-uuid", "target_price": 10},
+        {"query": "MacBook", "target_price": "nan"},
+        {"query": "MacBook", "target_price": -5},
+        {"target_price": 5},
+        {"_error": "Expected a JSON object"},
+    ]
+    result = import_watchlist(rows)
+
+    assert [r["status"] for r in result["results"]] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "not_found",
+        "invalid",
+        "invalid",
+        "invalid",
+        "invalid",
+        "invalid",
+    ]
+    assert result["summary"] == {
+        "created": 1,
+        "duplicate": 2,
+        "not_found": 1,
+        "invalid": 5,
+    }
+    assert result["results"][0]["product_name"].startswith("Sony")
+    assert len(repo.list_tracked_items()) == 2
+
+
+def test_reimport_detects_every_duplicate(repo):
+    catalog = repo.insert_products(
+        [
+            {"name": f"Bulk Product {i}", "category": "Bulk", "current_price": 10.0}
+            for i in range(1200)
+        ]
+    )
+    rows = [{"product_id": p["id"], "target_price": 5} for p in catalog]
+
+    assert import_watchlist(rows)["summary"] == {"created": 1200}
+    assert import_watchlist(rows)["summary"] == {"duplicate": 1200}
+
+
+def test_name_queries_match_like_search(repo, products):
+    result = import_watchlist(
+        [
+            {"query": "apple laptop", "target_price": 999},  # words in order
+            {"query": "Samsung 65 inch TV", "target_price": 900},  # skip words ignored
+        ]
+    )
+    names = [r["product_name"] for r in result["results"]]
+    assert names == ["Apple MacBook Air 13-inch Laptop", 'Samsung 65" QLED 4K Smart TV']
@@ -0,0 +1,108 @@
+"""Write-behind buffer flush, retry and shutdown."""
+
+import asyncio
+
+from app.services.write_buffer import MAX_ATTEMPTS, WriteBuffer
+
+
+def history_row(product_id: str, price: float) -> dict:
+    return {"product_id": product_id, "price": price}
+
+
+def bad_alert() -> dict:
+    # References a tracked item that doesn't exist (FK violation)
+    return {
+        "tracked_item_id": "missing",
+        "old_price": 1,
+        "new_price": 1,
+        "email_sent": False,
+    }
+
+
+def test_flush_writes_in_batches_and_notifies(repo, products):
+    buffer = WriteBuffer(max_rows=2, interval=60, max_pending=100)
+    flushed = []
+    buffer.add_flush_listener(lambda table, rows: flushed.append((table, len(rows))))
+
+    for price in range(5):
+        buffer.append("price_history", history_row(products[0]["id"], price))
+    assert buffer.depth()["price_history"] == 5
+    assert repo.page_rows("price_history", None, 10) == []
+
+    asyncio.run(buffer.flush())
+    assert buffer.depth()["price_history"] == 0
+    assert len(repo.page_rows("price_history", None, 10)) == 5
+    assert flushed == [("price_history", 2), ("price_history", 2), ("price_history", 1)]
+
+
+def test_failed_batch_is_requeued_then_written_row_by_row(repo, products):
+    buffer = WriteBuffer(max_rows=10, interval=60, max_pending=100)
+    good = {
+        "tracked_item_id": repo.insert_tracked_items(
+            [{"product_id": products[0]["id"], "target_price": 1}]
+        )[0]["id"],
+        "old_price": 2,
+        "new_price": 1,
+        "email_sent": True,
+    }
+    buffer.append("alerts", good)
+    buffer.append("alerts", bad_alert())
+
+    for _ in range(MAX_ATTEMPTS - 1):
+        asyncio.run(buffer.flush())
+        # The whole batch goes back in front of the queue
+        assert buffer.depth()["alerts"] == 2
+        assert repo.page_rows("alerts", None, 10) == []
+
+    asyncio.run(buffer.flush())
+    assert buffer.depth()["alerts"] == 0
+    assert buffer.dropped["alerts"] == 1
+    assert [a["tracked_item_id"] for a in repo.page_rows("alerts", None, 10)] == [
+        good["tracked_item_id"]
+    ]
+
+
+def test_full_queue_drops_new_rows(products):
+    buffer = WriteBuffer(max_rows=10, interval=60, max_pending=3)
+    for price in range(5):
+        buffer.append("price_history", history_row(products[0]["id"], price))
+
+    assert buffer.depth()["price_history"] == 3
+    assert buffer.dropped["price_history"] == 2
+
+
+def test_listener_errors_do_not_stop_flushing(repo, products):
+    buffer = WriteBuffer(max_rows=1, interval=60, max_pending=100)
+    buffer.add_flush_listener(lambda table, rows: 1 / 0)
+    for price in range(3):
+        buffer.append("price_history", history_row(products[0]["id"], price))
+
+    asyncio.run(buffer.flush())
+    assert len(repo.page_rows("price_history", None, 10)) == 3
+
+
+def test_background_flush_and_stop(repo, products):
+    buffer = WriteBuffer(max_rows=2, interval=60, max_pending=100)
+
+    async def run():
+        buffer.start()
+        # Reaching max_rows wakes the flusher before the interval
+        buffer.append("price_history", history_row(products[0]["id"], 1))
+        buffer.append("price_history", history_row(products[0]["id"], 2))
+        await asyncio.sleep(0.2)
+        assert len(repo.page_rows("price_history", None, 10)) == 2
+
+        # Shutdown flushes what is left
+        buffer.append("price_history", history_row(products[0]["id"], 3))
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert buffer.depth()["price_history"] == 0
+    assert len(repo.page_rows("price_history", None, 10)) == 3
+
+
+def test_clear_drops_pending_rows(products):
+    buffer = WriteBuffer(max_rows=10, interval=60, max_pending=100)
+    buffer.append("price_history", history_row(products[0]["id"], 1))
+    buffer.clear()
+    assert buffer.depth()["price_history"] == 0
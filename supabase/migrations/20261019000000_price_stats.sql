@@ -0,0 +1,5 @@
+-- Rolling price statistics per product (see backend/app/services/price_stats.py)
+create table if not exists price_stats (
+    product_id uuid primary key references products(id),
+    stats jsonb not null
+);